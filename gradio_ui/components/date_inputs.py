@@ -25,7 +25,7 @@ def get_current_datetime():
         return datetime.now()
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class WesternDateInputs:
     """Components for Western calendar date input"""
     year_dropdown: gr.Number
@@ -35,7 +35,7 @@ class WesternDateInputs:
     use_western_date: gr.State
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class GanzhiDateInputs:
     """Components for Gan-Zhi calendar date input"""
     # Display components
@@ -54,7 +54,7 @@ class GanzhiDateInputs:
     hour_pillar_state: gr.State
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class DateInputComponents:
     """Container for all date input components"""
     western: WesternDateInputs
@@ -204,7 +204,9 @@ def create_western_calendar_tab(active_tab_state: gr.State) -> Tuple[WesternDate
             input_component.change(
                 fn=mark_western_active,
                 inputs=[input_component],
-                outputs=[active_tab_state]
+                outputs=[active_tab_state],
+                queue=False,  # Immediate UI feedback
+                show_progress="hidden"
             )
         
         # Sync HTML5 inputs when number inputs change
@@ -212,25 +214,29 @@ def create_western_calendar_tab(active_tab_state: gr.State) -> Tuple[WesternDate
             fn=sync_from_numbers,
             inputs=[year_dropdown, month_dropdown, day_dropdown, hour_dropdown],
             outputs=[mobile_date_time_html],
-            queue=False  # Immediate UI feedback
+            queue=False,  # Immediate UI feedback
+            show_progress="hidden"
         )
         month_dropdown.change(
             fn=sync_from_numbers,
             inputs=[year_dropdown, month_dropdown, day_dropdown, hour_dropdown],
             outputs=[mobile_date_time_html],
-            queue=False  # Immediate UI feedback
+            queue=False,  # Immediate UI feedback
+            show_progress="hidden"
         )
         day_dropdown.change(
             fn=sync_from_numbers,
             inputs=[year_dropdown, month_dropdown, day_dropdown, hour_dropdown],
             outputs=[mobile_date_time_html],
-            queue=False  # Immediate UI feedback
+            queue=False,  # Immediate UI feedback
+            show_progress="hidden"
         )
         hour_dropdown.change(
             fn=sync_from_numbers,
             inputs=[year_dropdown, month_dropdown, day_dropdown, hour_dropdown],
             outputs=[mobile_date_time_html],
-            queue=False  # Immediate UI feedback
+            queue=False,  # Immediate UI feedback
+            show_progress="hidden"
         )
     
     western_inputs = WesternDateInputs(
@@ -460,7 +466,8 @@ def create_ganzhi_calendar_tab(active_tab_state: gr.State) -> Tuple[GanzhiDateIn
                 fn=handler,
                 inputs=[pillar_index_state, current_stem_state, current_branch_state, year_pillar_state, month_pillar_state, day_pillar_state, hour_pillar_state, active_tab_state],
                 outputs=[current_stem_state, current_branch_state, year_pillar_state, month_pillar_state, day_pillar_state, hour_pillar_state, year_display, month_display, day_display, hour_display, active_tab_state],
-                queue=False  # Immediate UI feedback
+                queue=False,  # Immediate UI feedback
+                show_progress="hidden"
             )
         
         # Wire up 地支 buttons
@@ -477,13 +484,16 @@ def create_ganzhi_calendar_tab(active_tab_state: gr.State) -> Tuple[GanzhiDateIn
                 fn=handler,
                 inputs=[pillar_index_state, current_stem_state, current_branch_state, year_pillar_state, month_pillar_state, day_pillar_state, hour_pillar_state, active_tab_state],
                 outputs=[current_stem_state, current_branch_state, pillar_index_state, year_pillar_state, month_pillar_state, day_pillar_state, hour_pillar_state, year_display, month_display, day_display, hour_display, active_tab_state],
-                queue=False  # Immediate UI feedback
+                queue=False,  # Immediate UI feedback
+                show_progress="hidden"
             )
         
         # Wire up reset button
         reset_btn.click(
             fn=reset_pillars,
-            outputs=[pillar_index_state, current_stem_state, current_branch_state, year_pillar_state, month_pillar_state, day_pillar_state, hour_pillar_state, year_display, month_display, day_display, hour_display, active_tab_state]
+            outputs=[pillar_index_state, current_stem_state, current_branch_state, year_pillar_state, month_pillar_state, day_pillar_state, hour_pillar_state, year_display, month_display, day_display, hour_display, active_tab_state],
+            queue=False,  # Immediate UI feedback
+            show_progress="hidden"
         )
         
         # Wire up display textboxes to sync with state variables when user types directly
@@ -509,28 +519,32 @@ def create_ganzhi_calendar_tab(active_tab_state: gr.State) -> Tuple[GanzhiDateIn
             fn=handle_year_display_change,
             inputs=[year_display, active_tab_state],
             outputs=[year_pillar_state, active_tab_state],
-            queue=False  # Immediate UI feedback
+            queue=False,  # Immediate UI feedback
+            show_progress="hidden"
         )
         
         month_display.change(
             fn=handle_month_display_change,
             inputs=[month_display, active_tab_state],
             outputs=[month_pillar_state, active_tab_state],
-            queue=False  # Immediate UI feedback
+            queue=False,  # Immediate UI feedback
+            show_progress="hidden"
         )
         
         day_display.change(
             fn=handle_day_display_change,
             inputs=[day_display, active_tab_state],
             outputs=[day_pillar_state, active_tab_state],
-            queue=False  # Immediate UI feedback
+            queue=False,  # Immediate UI feedback
+            show_progress="hidden"
         )
         
         hour_display.change(
             fn=handle_hour_display_change,
             inputs=[hour_display, active_tab_state],
             outputs=[hour_pillar_state, active_tab_state],
-            queue=False  # Immediate UI feedback
+            queue=False,  # Immediate UI feedback
+            show_progress="hidden"
         )
     
     ganzhi_inputs = GanzhiDateInputs(
@@ -7,6 +7,7 @@ This module contains reusable components for hexagram input:
 """
 
 from dataclasses import dataclass
+from functools import lru_cache, partial
 from typing import List, Tuple, Callable
 
 import gradio as gr
@@ -17,52 +18,122 @@ from ..utils.html_generator import (
     create_changed_line_html
 )
 from ..utils.hexagram_utils import (
-    search_hexagram_by_name,
-    search_hexagram_by_trigrams,
+    search_hexagram_by_name_choices,
+    search_hexagram_by_trigrams_choices,
     get_hexagram_code_from_dropdown,
-    calculate_changed_hexagram
+    HEXAGRAM_CODE_BY_BITS,
+    hexagram_code_to_bits,
+    changing_lines_to_mask,
+    calculate_changed_hexagram_from_mask
 )
 
 
-@dataclass
+# Inline styles for the muted hint under a tab title / column title
+_TAB_HINT_STYLE = "color: #868e96; font-size: 13px; margin-top: -6px; margin-bottom: 12px;"
+_COLUMN_HINT_STYLE = "color: #868e96; font-size: 12px; margin-top: -6px; margin-bottom: 10px;"
+
+
+def _section_header(title, hint, hint_style=_COLUMN_HINT_STYLE):
+    """Section title and muted hint rendered as one Markdown component"""
+    return gr.Markdown(
+        f"### {title}\n\n<div class=\"text-muted\"><p style='{hint_style}'>{hint}</p></div>",
+        elem_classes=["section-header"]
+    )
+
+
+# Line numbers in display order (top to bottom) and the matching button ids
+_VISUAL_ORDER = (6, 5, 4, 3, 2, 1)
+_ELEM_IDS = tuple(f"yao-btn-{line_num}" for line_num in _VISUAL_ORDER)
+
+# Base CSS classes for the clickable line buttons ("changing" is appended when needed)
+_YANG_CLASSES_BASE = ("yao-line-button", "yang-button")
+_YIN_CLASSES_BASE = ("yao-line-button", "yin-button")
+
+# Shared no-op updates. Only an argument-less gr.update() can be shared: Gradio
+# pops "value" from the returned update dict in place, so updates carrying a value
+# (e.g. the changing-lines reset) must be built fresh on every call
+_NOOP = gr.update()
+_NOOP_12 = [_NOOP] * 12
+
+# Coin toss outcomes indexed by outcome (0=正正正, 1=正正反, 2=正反反, 3=反反反)
+_OUTCOME_COINS = (
+    (True, True, True),
+    (True, True, False),
+    (True, False, False),
+    (False, False, False),
+)
+# 正正正 (3 heads) or 正正反 (2 heads 1 tail) → yang; 正反反 or 反反反 → yin
+_OUTCOME_IS_YANG = (True, True, False, False)
+
+# Coin outcome button classes: unselected, and selected for a yang / yin outcome
+_COIN_CLASSES_DEFAULT = ("coin-outcome-button",)
+_COIN_CLASSES_SELECTED_YANG = ("coin-outcome-button", "coin-outcome-selected", "coin-yang")
+_COIN_CLASSES_SELECTED_YIN = ("coin-outcome-button", "coin-outcome-selected", "coin-yin")
+# Classes of a line's 4 outcome buttons, indexed by the selected outcome
+# (selected button: red for yang, green for yin)
+_COIN_LINE_CLASSES = tuple(
+    tuple(
+        (_COIN_CLASSES_SELECTED_YANG if _OUTCOME_IS_YANG[selected] else _COIN_CLASSES_SELECTED_YIN)
+        if out_idx == selected else _COIN_CLASSES_DEFAULT
+        for out_idx in range(4)
+    )
+    for selected in range(4)
+)
+
+# Static coin line labels (line 1 first), same markup the old "**丟第N次的結果**"
+# Markdown rendered, as plain HTML so the client skips Markdown parsing
+_COIN_LINE_LABELS = tuple(f"<p><strong>丟第{line_num}次的結果</strong></p>" for line_num in range(1, 7))
+
+# The clickable tab keeps its code as a 6-bit int (bit 0 = line 1)
+_DEFAULT_CODE_BITS = hexagram_code_to_bits(DEFAULT_HEXAGRAM_CODE)
+
+# Initial line HTML for DEFAULT_HEXAGRAM_CODE in display order (6 to 1), built once at import
+_INITIAL_NAME_LINES = tuple(
+    create_line_html(DEFAULT_HEXAGRAM_CODE, line_num, False, clickable=False) for line_num in _VISUAL_ORDER
+)
+# Changed (變卦) lines start as the default hexagram in both tabs; same markup the
+# handlers render, so per-line no-op updates never leave stale HTML behind
+_INITIAL_CHANGED_LINES = tuple(
+    create_changed_line_html(DEFAULT_HEXAGRAM_CODE, line_num) for line_num in _VISUAL_ORDER
+)
+
+
+@dataclass(slots=True, frozen=True)
 class NameSearchHexagramInputs:
     """Components for hexagram name search input tab"""
     element_buttons: List[Tuple[str, gr.Button]]
-    outer_element_state: gr.State
-    inner_element_state: gr.State
+    outer_element_state: gr.State  # pending outer element, "" when no selection is in progress
     hexagram_dropdown: gr.Dropdown
     selected_hexagram_code_state: gr.State
-    changing_checkboxes: List[gr.Checkbox]
+    changing_checkbox_group: gr.CheckboxGroup  # value: changing line numbers (1-6)
     hexagram_line_containers: List[gr.HTML]
     changed_hexagram_line_containers: List[gr.HTML]
     calculate_btn: gr.Button
     compact_view_checkbox: gr.Checkbox
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ClickableHexagramInputs:
     """Components for clickable hexagram input tab"""
     clickable_hexagram_code_state: gr.State
-    clickable_changing_state_vars: List[gr.State]  # 6 state variables
     clickable_line_buttons: List[Tuple[int, gr.Button]]  # (line_num, button)
-    clickable_changing_checkboxes: List[gr.Checkbox]
+    clickable_changing_checkboxes: List[gr.Checkbox]  # index 0 = 1爻, index 5 = 6爻
     clickable_changed_hexagram_line_containers: List[gr.HTML]
     calculate_btn: gr.Button
     compact_view_checkbox: gr.Checkbox
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class CoinTossHexagramInputs:
     """Components for coin toss input tab"""
     coin_toss_hexagram_code_state: gr.State
-    coin_toss_changing_state_vars: List[gr.State]  # 6 state variables
     outcome_buttons: List[List[gr.Button]]  # 6 lines × 4 outcome buttons per line
-    selected_outcome_states: List[gr.State]  # 6 state variables (0-3 for each line)
+    selected_outcomes_state: gr.State  # tuple of 6 outcome indices (0-3), line 1 first
     calculate_btn: gr.Button
     compact_view_checkbox: gr.Checkbox
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class HexagramInputComponents:
     """Container for all hexagram input components"""
     name_search: NameSearchHexagramInputs
@@ -71,6 +142,154 @@ class HexagramInputComponents:
     hexagram_tabs: gr.Tabs
 
 
+def _only_changed(new_htmls, old_htmls):
+    """Keep the HTML of lines that differ from what is on screen, gr.update() for the rest"""
+    return [_NOOP if new_html == old_html else new_html
+            for new_html, old_html in zip(new_htmls, old_htmls)]
+
+
+@lru_cache(maxsize=4096)
+def _name_line_htmls(code, changing_mask):
+    """Original and changed line HTML for the name search tab, in visual order (6 to 1)"""
+    # Calculate changed hexagram code (cached per code/mask pair)
+    changed_code = calculate_changed_hexagram_from_mask(code, changing_mask)
+    original_line_htmls = tuple(
+        create_line_html(code, line_num, bool((changing_mask >> (line_num - 1)) & 1), clickable=False)
+        for line_num in _VISUAL_ORDER
+    )
+    changed_line_htmls = tuple(
+        create_changed_line_html(changed_code, line_num) for line_num in _VISUAL_ORDER
+    )
+    return original_line_htmls, changed_line_htmls
+
+
+# Function to update hexagram line displays
+def update_hexagram_lines(code, changing_lines, rendered_key=None):
+    """Update all hexagram line displays (both original and changed)
+    
+    Args:
+        code: Hexagram code (6 digits, index 0 = line 1, index 5 = line 6)
+        changing_lines: Changing line numbers (1-6) from the checkbox group
+        rendered_key: (code, changing mask) currently on screen, if known; lines
+            that would not change are returned as gr.update()
+    
+    Returns:
+        Tuple of (original_line_htmls, changed_line_htmls)
+    """
+    if not code or len(code) != 6:
+        code = DEFAULT_HEXAGRAM_CODE
+    
+    # Pack the checkbox group value (changing line numbers) into a bitmask once
+    changing_mask = changing_lines_to_mask(changing_lines or [])
+    original_line_htmls, changed_line_htmls = _name_line_htmls(code, changing_mask)
+    
+    if rendered_key is None:
+        # Return both in visual order (6 to 1, top to bottom)
+        return list(original_line_htmls), list(changed_line_htmls)
+    
+    # Only send the lines that differ from the ones already rendered
+    old_original_htmls, old_changed_htmls = _name_line_htmls(*rendered_key)
+    return (
+        _only_changed(original_line_htmls, old_original_htmls),
+        _only_changed(changed_line_htmls, old_changed_htmls)
+    )
+
+
+# Handler for element button clicks
+def handle_element_click(clicked_element, current_outer, changing_lines, rendered_key=None):
+    """Handle click on an element button"""
+    new_element = clicked_element
+    # Only push the changing-lines reset when something is actually checked
+    changing_reset = gr.update(value=[]) if changing_lines else _NOOP
+    
+    if not current_outer:
+        # First click - select outer element
+        selection_text = f"{new_element}[待選內卦]"
+        return (
+            new_element,  # outer_element_state
+            gr.Dropdown(choices=[selection_text], value=selection_text),  # dropdown - show selection text in choices
+            "",  # selected_hexagram_code_state
+            changing_reset,  # checkbox group update
+            _NOOP,  # rendered_lines_key_state (lines untouched)
+            *_NOOP_12  # original and changed line updates
+        )
+    
+    # Second click - select inner element
+    inner_element = new_element
+    selection_text = f"{current_outer}{inner_element}"
+    
+    # Search for hexagrams matching both trigrams
+    choices, selected_code = search_hexagram_by_trigrams_choices(current_outer, inner_element)
+    
+    if choices:
+        selected_value = choices[0]
+        # Update hexagram lines (both original and changed)
+        original_updates, changed_updates = update_hexagram_lines(selected_code, [], rendered_key)
+        
+        # Reset for next selection
+        return (
+            "",  # outer_element_state (reset)
+            gr.Dropdown(choices=list(choices), value=selected_value),  # dropdown
+            selected_code,  # selected_hexagram_code_state
+            changing_reset,  # reset changing lines when new hexagram is selected
+            (selected_code, 0),  # rendered_lines_key_state
+            *original_updates,  # original line updates
+            *changed_updates    # changed line updates
+        )
+    else:
+        # No matches found
+        return (
+            "",  # outer_element_state (reset)
+            gr.Dropdown(choices=[], value=None),  # dropdown
+            "",  # selected_hexagram_code_state
+            changing_reset,  # checkbox group update
+            _NOOP,  # rendered_lines_key_state (lines untouched)
+            *_NOOP_12  # original and changed line updates
+        )
+
+
+# Update dropdown when name changes (kept for backward compatibility if needed)
+def on_name_change(query):
+    choices, selected_code = search_hexagram_by_name_choices(query)
+    if choices:
+        selected_value = choices[0]
+        # Update hexagram lines (both original and changed)
+        original_updates, changed_updates = update_hexagram_lines(selected_code, [])
+        # Reset changing lines when new hexagram is selected
+        return [gr.Dropdown(choices=list(choices), value=selected_value), selected_code, gr.update(value=[])] + original_updates + changed_updates
+    # When no matches, clear dropdown and reset to empty
+    return [gr.Dropdown(choices=[], value=None), "", gr.update(value=[])] + _NOOP_12
+
+
+# When hexagram is selected from dropdown, update lines and state
+def on_dropdown_select(dropdown_value, changing_lines, rendered_key):
+    code = get_hexagram_code_from_dropdown(dropdown_value)
+    if not code or len(code) != 6:
+        code = DEFAULT_HEXAGRAM_CODE
+    
+    key = (code, changing_lines_to_mask(changing_lines or []))
+    if key == rendered_key:
+        # Lines already show this hexagram (e.g. set by an element click)
+        return [code, _NOOP] + _NOOP_12
+    
+    original_updates, changed_updates = update_hexagram_lines(code, changing_lines, rendered_key)
+    return [code, key] + original_updates + changed_updates
+
+
+# When changing lines checkboxes change, update hexagram lines
+def update_lines_with_changing(code, changing_lines, rendered_key):
+    if not code or len(code) != 6:
+        code = DEFAULT_HEXAGRAM_CODE
+    
+    key = (code, changing_lines_to_mask(changing_lines or []))
+    if key == rendered_key:
+        # Nothing to redraw (e.g. the group was reset to an empty selection)
+        return [_NOOP] + _NOOP_12
+    
+    original_updates, changed_updates = update_hexagram_lines(code, changing_lines, rendered_key)
+    return [key] + original_updates + changed_updates
+
+
 def create_name_search_tab() -> Tuple[NameSearchHexagramInputs, Callable]:
     """
     Create the hexagram name search input tab with all handlers
@@ -78,11 +297,7 @@ def create_name_search_tab() -> Tuple[NameSearchHexagramInputs, Callable]:
     Returns:
         Tuple of (NameSearchHexagramInputs, setup_handlers function)
     """
-    gr.Markdown("### 選擇卦象", elem_classes=["section-header"])
-    gr.Markdown(
-        "<p style='color: #868e96; font-size: 13px; margin-top: -6px; margin-bottom: 12px;'>點擊兩次選擇外卦和內卦（例如：點擊兩次「天」為「乾為天」）</p>",
-        elem_classes=["text-muted"]
-    )
+    _section_header("選擇卦象", "點擊兩次選擇外卦和內卦（例如：點擊兩次「天」為「乾為天」）", _TAB_HINT_STYLE)
     
     # 8 trigram element buttons
     ELEMENT_NAMES = ["天", "地", "水", "火", "風", "雷", "山", "澤"]
@@ -114,239 +329,97 @@ def create_name_search_tab() -> Tuple[NameSearchHexagramInputs, Callable]:
     
     # State variables for tracking selections
     outer_element_state = gr.State(value="")
-    inner_element_state = gr.State(value="")
     
     # Store selected hexagram code
     selected_hexagram_code_state = gr.State(value=DEFAULT_HEXAGRAM_CODE)
+    
+    # (code, changing mask) currently rendered in the line containers, per session,
+    # so cascaded change events that would redraw the same lines can be skipped
+    rendered_lines_key_state = gr.State(value=(DEFAULT_HEXAGRAM_CODE, 0))
         
     # Create a container for hexagram lines with checkboxes and changed hexagram
     with gr.Row(elem_classes=["hexagram-display-row"]):
         # Left column: Original hexagram (本卦)
         with gr.Column(scale=3, elem_classes=["column-spacing"]):
-            gr.Markdown("### 本卦", elem_classes=["section-header"])
-            gr.Markdown(
-                "<p style='color: #868e96; font-size: 12px; margin-top: -6px; margin-bottom: 10px;'>原始卦象</p>",
-                elem_classes=["text-muted"]
-            )
-            hexagram_line_containers = []
-            initial_code = DEFAULT_HEXAGRAM_CODE
-            # Create in reverse order for display (6 to 1)
-            for i in range(5, -1, -1):  # 5 to 0, so line 6 to line 1
-                line_num = i + 1
-                initial_html = create_line_html(initial_code, line_num, False, clickable=False)
-                line_html = gr.HTML(
-                    value=initial_html,
-                    elem_classes=["hexagram-line-container"]
-                )
-                hexagram_line_containers.append(line_html)
+            _section_header("本卦", "原始卦象")
+            # Create in display order (6 to 1)
+            hexagram_line_containers = [
+                gr.HTML(value=initial_html, elem_classes=["hexagram-line-container"])
+                for initial_html in _INITIAL_NAME_LINES
+            ]
         
         # Middle column: Checkboxes for 動爻
         with gr.Column(scale=1, elem_classes=["column-spacing"]):
-            gr.Markdown("### 動爻", elem_classes=["section-header"])
-            gr.Markdown(
-                "<p style='color: #868e96; font-size: 12px; margin-top: -6px; margin-bottom: 10px; line-height: 1.6; overflow: visible; white-space: normal; word-wrap: break-word;'>選擇變化的爻</p>",
-                elem_classes=["text-muted"]
+            _section_header("動爻", "選擇變化的爻")
+            # Single group for all 6 lines: one change listener instead of six.
+            # Choices are in display order (6 to 1); the value is the list of
+            # changing line numbers, e.g. [6, 1]
+            changing_checkbox_group = gr.CheckboxGroup(
+                choices=[(f"{line_num}爻", line_num) for line_num in _VISUAL_ORDER],
+                value=[],
+                interactive=True,
+                show_label=False,
+                elem_classes=["changing-yao-group"],
+                container=False
             )
-            changing_checkboxes = []
-            # Create in reverse order for display (6 to 1)
-            for i in range(5, -1, -1):  # 5 to 0, so line 6 to line 1
-                line_num = i + 1
-                checkbox = gr.Checkbox(
-                    label=f"{line_num}爻",
-                    value=False,
-                    interactive=True,
-                    elem_classes=["changing-yao-checkbox"],
-                    container=True
-                )
-                changing_checkboxes.append(checkbox)
-        
+
         # Right column: Changed hexagram (變卦)
         with gr.Column(scale=3, elem_classes=["column-spacing"]):
-            gr.Markdown("### 變卦", elem_classes=["section-header"])
-            gr.Markdown(
-                "<p style='color: #868e96; font-size: 12px; margin-top: -6px; margin-bottom: 10px;'>變化後的卦象</p>",
-                elem_classes=["text-muted"]
-            )
-            changed_hexagram_line_containers = []
-            initial_code = DEFAULT_HEXAGRAM_CODE
-            # Create in reverse order for display (6 to 1)
-            for i in range(5, -1, -1):  # 5 to 0, so line 6 to line 1
-                line_num = i + 1
-                initial_html = create_line_html(initial_code, line_num, False, clickable=False)
-                line_html = gr.HTML(
-                    value=initial_html,
-                    elem_classes=["hexagram-line-container"]
-                )
-                changed_hexagram_line_containers.append(line_html)
-    
-    # Function to update hexagram line displays
-    def update_hexagram_lines(code, *changing_lines):
-        """Update all hexagram line displays (both original and changed)
-        
-        Args:
-            code: Hexagram code (6 digits, index 0 = line 1, index 5 = line 6)
-            *changing_lines: Checkbox values in visual order [6,5,4,3,2,1] (top to bottom)
-        
-        Returns:
-            Tuple of (original_line_htmls, changed_line_htmls)
-        """
-        if not code or len(code) != 6:
-            code = DEFAULT_HEXAGRAM_CODE
-        
-        # Map checkbox values to line numbers
-        # changing_lines[0] = line 6 (top), changing_lines[5] = line 1 (bottom)
-        changing = []
-        for visual_index, is_changing in enumerate(changing_lines):
-            line_num = 6 - visual_index  # visual_index 0 -> line 6, visual_index 5 -> line 1
-            if is_changing:
-                changing.append(line_num)
-        
-        # Calculate changed hexagram code
-        changed_code = calculate_changed_hexagram(code, changing)
-        
-        # Create HTML for original hexagram lines in visual order (6 to 1, top to bottom)
-        original_line_htmls = []
-        changed_line_htmls = []
-        
-        for visual_index in range(6):
-            line_num = 6 - visual_index  # line 6, 5, 4, 3, 2, 1
-            is_changing_line = line_num in changing
-            original_html = create_line_html(code, line_num, is_changing_line, clickable=False)
-            original_line_htmls.append(original_html)
-            
-            # Changed hexagram line
-            changed_html = create_changed_line_html(changed_code, line_num)
-            changed_line_htmls.append(changed_html)
-        
-        # Return both in visual order (6 to 1, top to bottom)
-        return original_line_htmls, changed_line_htmls
-    
-    # Handler for element button clicks
-    def handle_element_click(clicked_element, current_outer, current_inner, *changing_lines):
-        """Handle click on an element button"""
-        new_element = clicked_element
-        
-        if not current_outer:
-            # First click - select outer element
-            selection_text = f"{new_element}[待選內卦]"
-            return (
-                new_element,  # outer_element_state
-                "",  # inner_element_state
-                gr.Dropdown(choices=[selection_text], value=selection_text),  # dropdown - show selection text in choices
-                "",  # selected_hexagram_code_state
-                *[gr.update(value=False)] * 6,  # checkbox updates
-                *[gr.update()] * 6,  # original line updates
-                *[gr.update()] * 6   # changed line updates
-            )
-        
-        # Second click - select inner element
-        inner_element = new_element
-        selection_text = f"{current_outer}{inner_element}"
-        
-        # Search for hexagrams matching both trigrams
-        matches = search_hexagram_by_trigrams(current_outer, inner_element)
-        
-        if matches:
-            choices = [f"{code} - {name}" for code, name in matches]
-            selected_code = matches[0][0]
-            selected_value = choices[0]
-            # Reset all changing checkboxes when new hexagram is selected
-            checkbox_updates = [gr.update(value=False)] * 6
-            # Update hexagram lines (both original and changed)
-            original_updates, changed_updates = update_hexagram_lines(selected_code, *[False] * 6)
-            
-            # Reset for next selection
-            return (
-                "",  # outer_element_state (reset)
-                "",  # inner_element_state (reset)
-                gr.Dropdown(choices=choices, value=selected_value),  # dropdown
-                selected_code,  # selected_hexagram_code_state
-                *checkbox_updates,  # checkbox updates
-                *original_updates,  # original line updates
-                *changed_updates    # changed line updates
-            )
-        else:
-            # No matches found
-            return (
-                "",  # outer_element_state (reset)
-                "",  # inner_element_state (reset)
-                gr.Dropdown(choices=[], value=None),  # dropdown
-                "",  # selected_hexagram_code_state
-                *[gr.update(value=False)] * 6,  # checkbox updates
-                *[gr.update()] * 6,  # original line updates
-                *[gr.update()] * 6   # changed line updates
-            )
-    
-    # Update dropdown when name changes (kept for backward compatibility if needed)
-    def on_name_change(query):
-        matches = search_hexagram_by_name(query)
-        if matches:
-            choices = [f"{code} - {name}" for code, name in matches]
-            selected_code = matches[0][0] if matches else ""
-            selected_value = choices[0] if choices else None
-            # Reset all changing checkboxes when new hexagram is selected
-            checkbox_updates = [gr.update(value=False)] * 6
-            # Update hexagram lines (both original and changed)
-            original_updates, changed_updates = update_hexagram_lines(selected_code, *[False] * 6)
-            return [gr.Dropdown(choices=choices, value=selected_value), selected_code] + checkbox_updates + original_updates + changed_updates
-        # When no matches, clear dropdown and reset to empty
-        return [gr.Dropdown(choices=[], value=None), ""] + [gr.update(value=False)] * 6 + [gr.update()] * 6 + [gr.update()] * 6
-    
-    # When hexagram is selected from dropdown, update lines and state
-    def on_dropdown_select(dropdown_value, *changing_lines):
-        code = get_hexagram_code_from_dropdown(dropdown_value)
-        if not code or len(code) != 6:
-            code = DEFAULT_HEXAGRAM_CODE
-        
-        original_updates, changed_updates = update_hexagram_lines(code, *changing_lines)
-        return [code] + original_updates + changed_updates
-    
-    # When changing lines checkboxes change, update hexagram lines
-    def update_lines_with_changing(code, *changing_lines):
-        if not code or len(code) != 6:
-            code = DEFAULT_HEXAGRAM_CODE
-        
-        original_updates, changed_updates = update_hexagram_lines(code, *changing_lines)
-        return original_updates + changed_updates
+            _section_header("變卦", "變化後的卦象")
+            # Create in display order (6 to 1); same markup update_hexagram_lines
+            # renders, so the initial render key holds
+            changed_hexagram_line_containers = [
+                gr.HTML(value=initial_html, elem_classes=["hexagram-line-container"])
+                for initial_html in _INITIAL_CHANGED_LINES
+            ]
     
     # Setup handlers function
     def setup_handlers():
-        # Wire up element buttons
-        def make_element_handler(element):
-            def handler(current_outer, current_inner, *changing_lines):
-                return handle_element_click(element, current_outer, current_inner, *changing_lines)
-            return handler
-        
-        for element, button in element_buttons:
-            handler = make_element_handler(element)
-            button.click(
-                fn=handler,
-                inputs=[outer_element_state, inner_element_state] + changing_checkboxes,
-                outputs=[
-                    outer_element_state,
-                    inner_element_state,
-                    hexagram_dropdown,
-                    selected_hexagram_code_state
-                ] + changing_checkboxes + hexagram_line_containers + changed_hexagram_line_containers,
-                queue=False  # Immediate UI feedback
-            )
+        # Wire up element buttons: one listener for all 8 buttons, the
+        # clicked element is looked up from the event's target button
+        element_by_button = {button: element for element, button in element_buttons}
+        
+        def dispatch_element_click(evt: gr.EventData, current_outer, changing_lines, rendered_key):
+            element = element_by_button[evt.target]
+            return handle_element_click(element, current_outer, changing_lines, rendered_key)
+        
+        gr.on(
+            triggers=[button.click for _, button in element_buttons],
+            fn=dispatch_element_click,
+            inputs=[outer_element_state, changing_checkbox_group, rendered_lines_key_state],
+            outputs=[
+                outer_element_state,
+                hexagram_dropdown,
+                selected_hexagram_code_state,
+                changing_checkbox_group,
+                rendered_lines_key_state
+            ] + hexagram_line_containers + changed_hexagram_line_containers,
+            queue=False,  # Immediate UI feedback
+            show_progress="hidden"
+        )
         
         # Update lines when dropdown changes
         hexagram_dropdown.change(
             fn=on_dropdown_select,
-            inputs=[hexagram_dropdown] + changing_checkboxes,
-            outputs=[selected_hexagram_code_state] + hexagram_line_containers + changed_hexagram_line_containers,
-            queue=False  # Immediate UI feedback
+            inputs=[hexagram_dropdown, changing_checkbox_group, rendered_lines_key_state],
+            outputs=[selected_hexagram_code_state, rendered_lines_key_state] + hexagram_line_containers + changed_hexagram_line_containers,
+            queue=False,  # Immediate UI feedback
+            show_progress="hidden"
         )
         
-        # Update lines when changing checkboxes change
-        for checkbox in changing_checkboxes:
-            checkbox.change(
-                fn=update_lines_with_changing,
-                inputs=[selected_hexagram_code_state] + changing_checkboxes,
-                outputs=hexagram_line_containers + changed_hexagram_line_containers,
-                queue=False  # Immediate UI feedback
-            )
+        # Update lines when the user changes the changing lines (one listener for all
+        # 6 lines). .input skips the programmatic resets from element clicks, whose
+        # lines are already redrawn by the click itself or the dropdown change
+        changing_checkbox_group.input(
+            fn=update_lines_with_changing,
+            inputs=[selected_hexagram_code_state, changing_checkbox_group, rendered_lines_key_state],
+            outputs=[rendered_lines_key_state] + hexagram_line_containers + changed_hexagram_line_containers,
+            queue=False,  # Immediate UI feedback
+            show_progress="hidden",
+            # Toggles made while a request is in flight collapse into one
+            # follow-up run with the latest values instead of being dropped
+            trigger_mode="always_last"
+        )
     
     # Calculate button with compact view checkbox
     gr.Markdown("---", elem_classes=["section-divider"])
@@ -362,10 +435,9 @@ def create_name_search_tab() -> Tuple[NameSearchHexagramInputs, Callable]:
     name_search_inputs = NameSearchHexagramInputs(
         element_buttons=element_buttons,
         outer_element_state=outer_element_state,
-        inner_element_state=inner_element_state,
         hexagram_dropdown=hexagram_dropdown,
         selected_hexagram_code_state=selected_hexagram_code_state,
-        changing_checkboxes=changing_checkboxes,
+        changing_checkbox_group=changing_checkbox_group,
         hexagram_line_containers=hexagram_line_containers,
         changed_hexagram_line_containers=changed_hexagram_line_containers,
         calculate_btn=calculate_btn,
@@ -375,6 +447,101 @@ def create_name_search_tab() -> Tuple[NameSearchHexagramInputs, Callable]:
     return name_search_inputs, setup_handlers
 
 
+def _checkbox_values_to_mask(changing_lines):
+    """Pack the clickable tab's checkbox values (1爻 first) into a changing-line bitmask"""
+    changing_mask = 0
+    for index, is_changing in enumerate(changing_lines):
+        if is_changing:
+            changing_mask |= 1 << index
+    return changing_mask
+
+
+@lru_cache(maxsize=None)
+def _button_text(line_num, is_yang, is_changing):
+    """Clickable line button text; only 6 x 2 x 2 variants, filled lazily so UI_CONFIG is read at first use"""
+    line_symbol = UI_CONFIG.line_symbol_yang if is_yang else UI_CONFIG.line_symbol_yin
+    change_mark = (UI_CONFIG.change_mark_yang if is_yang else UI_CONFIG.change_mark_yin) if is_changing else ""
+    # Format: "SYMBOL line_num爻 change_mark" - no kanji in button text, CSS will add kanji on mobile via ::before
+    return f"{line_symbol}{line_num}爻 {change_mark}"
+
+
+@lru_cache(maxsize=None)
+def _button_props(line_num, is_yang, is_changing):
+    """Clickable line button (text, classes); classes are a tuple so the cached value stays immutable"""
+    button_classes = _YANG_CLASSES_BASE if is_yang else _YIN_CLASSES_BASE
+    if is_changing:
+        button_classes += ("changing",)
+    return _button_text(line_num, is_yang, is_changing), button_classes
+
+
+def _clickable_button_update(code, changing_mask, line_num):
+    """Button update for one clickable line (code and changing_mask are 6-bit ints, bit 0 = 1爻)"""
+    is_yang = bool((code >> (line_num - 1)) & 1)
+    is_changing = bool((changing_mask >> (line_num - 1)) & 1)
+    button_text, button_classes = _button_props(line_num, is_yang, is_changing)
+    
+    # Fresh update dict and class list per event; only the plain values are cached
+    return gr.update(value=button_text, elem_classes=list(button_classes), elem_id=_ELEM_IDS[6 - line_num])
+
+
+@lru_cache(maxsize=32768)
+def _line_click_result(current_code, line_num, changing_mask):
+    """New code and the clicked line's changed (變卦) HTML; 64 codes x 6 lines x 64 masks at most"""
+    # Toggle the line
+    new_code = current_code ^ (1 << (line_num - 1))
+    
+    # Calculate changed hexagram code (table lookup per code/mask pair)
+    changed_code = calculate_changed_hexagram_from_mask(HEXAGRAM_CODE_BY_BITS[new_code], changing_mask)
+    return new_code, create_changed_line_html(changed_code, line_num)
+
+
+# Function to handle line button clicks
+def handle_line_click(line_num, current_code, *changing_lines):
+    """Handle click on a line button - optimized for speed
+    
+    Toggling a line only changes that line's button and changed (變卦) line,
+    so those two are the only display outputs.
+    
+    Returns:
+        [new_code, clicked button update, clicked line's changed HTML]
+    """
+    if not isinstance(current_code, int) or not 0 <= current_code < 64:
+        current_code = _DEFAULT_CODE_BITS
+    
+    # Map checkbox values to a changing-line bitmask (only once)
+    changing_mask = _checkbox_values_to_mask(changing_lines)
+    
+    # Repeat clicks on the same (code, line, mask) are a single cache hit
+    new_code, changed_line_html = _line_click_result(current_code, line_num, changing_mask)
+    
+    return [new_code, _clickable_button_update(new_code, changing_mask, line_num), changed_line_html]
+
+
+# Function to update displays when changing checkboxes change
+def update_clickable_with_changing(toggled_line, code, *changing_lines):
+    """Update displays when a changing line checkbox changes
+    
+    Only the toggled line's button and changed (變卦) line can differ from
+    what is on screen, so those two are the only display outputs.
+    
+    Returns:
+        [toggled button update, toggled line's changed HTML]
+    """
+    if not isinstance(code, int) or not 0 <= code < 64:
+        code = _DEFAULT_CODE_BITS
+    
+    # Map checkbox values to a changing-line bitmask (bit 0 = 1爻)
+    changing_mask = _checkbox_values_to_mask(changing_lines)
+    
+    # Calculate changed hexagram code (cached per code/mask pair)
+    changed_code = calculate_changed_hexagram_from_mask(HEXAGRAM_CODE_BY_BITS[code], changing_mask)
+    
+    return [
+        _clickable_button_update(code, changing_mask, toggled_line),
+        create_changed_line_html(changed_code, toggled_line)
+    ]
+
+
 def create_clickable_tab() -> Tuple[ClickableHexagramInputs, Callable]:
     """
     Create the clickable hexagram input tab with all handlers
@@ -382,108 +549,33 @@ def create_clickable_tab() -> Tuple[ClickableHexagramInputs, Callable]:
     Returns:
         Tuple of (ClickableHexagramInputs, setup_handlers function)
     """
-    gr.Markdown("### 點擊爻線輸入卦象", elem_classes=["section-header"])
-    gr.Markdown(
-        "<p style='color: #868e96; font-size: 13px; margin-top: -6px; margin-bottom: 12px;'>點擊下方的爻線來切換陽爻（▅▅▅▅▅▅）和陰爻（▅▅  ▅▅）</p>",
-        elem_classes=["text-muted"]
-    )
+    _section_header("點擊爻線輸入卦象", "點擊下方的爻線來切換陽爻（▅▅▅▅▅▅）和陰爻（▅▅  ▅▅）", _TAB_HINT_STYLE)
     
-    # Store hexagram code state
-    clickable_hexagram_code_state = gr.State(value=DEFAULT_HEXAGRAM_CODE)
-    
-    # Store changing lines state (for checkboxes)
-    clickable_changing_state_1 = gr.State(value=False)  # 1爻
-    clickable_changing_state_2 = gr.State(value=False)  # 2爻
-    clickable_changing_state_3 = gr.State(value=False)  # 3爻
-    clickable_changing_state_4 = gr.State(value=False)  # 4爻
-    clickable_changing_state_5 = gr.State(value=False)  # 5爻
-    clickable_changing_state_6 = gr.State(value=False)  # 6爻
-    clickable_changing_state_vars = [
-        clickable_changing_state_1,
-        clickable_changing_state_2,
-        clickable_changing_state_3,
-        clickable_changing_state_4,
-        clickable_changing_state_5,
-        clickable_changing_state_6
-    ]
-    
-    # Function to update clickable hexagram displays
-    def update_clickable_hexagram_display(code, *changing_lines):
-        """Update all hexagram displays when code or changing lines change"""
-        if not code or len(code) != 6:
-            code = DEFAULT_HEXAGRAM_CODE
-        
-        # Map checkbox values to line numbers
-        # changing_lines[0] = 6爻 (top), changing_lines[5] = 1爻 (bottom)
-        changing = []
-        for visual_index, is_changing in enumerate(changing_lines):
-            line_num = 6 - visual_index
-            if is_changing:
-                changing.append(line_num)
-        
-        # Calculate changed hexagram code
-        changed_code = calculate_changed_hexagram(code, changing)
-        
-        # Create HTML for original hexagram lines in visual order (6 to 1, top to bottom)
-        original_line_htmls = []
-        changed_line_htmls = []
-        
-        for visual_index in range(6):
-            line_num = 6 - visual_index
-            is_changing_line = line_num in changing
-            original_html = create_line_html(code, line_num, is_changing_line, clickable=True)
-            original_line_htmls.append(original_html)
-            
-            # Changed hexagram line
-            changed_html = create_changed_line_html(changed_code, line_num)
-            changed_html = changed_html.replace(f">{line_num}爻", f">  {line_num}爻")
-            changed_line_htmls.append(changed_html)
-        
-        return code, original_line_htmls, changed_line_htmls
+    # Store hexagram code state as a 6-bit int (bit 0 = 1爻), so a click is one XOR
+    clickable_hexagram_code_state = gr.State(value=_DEFAULT_CODE_BITS)
     
     # Create a container for hexagram lines with checkboxes and changed hexagram
     with gr.Row(elem_classes=["hexagram-display-row"]):
         # Left column: Original hexagram (本卦) with clickable lines
         with gr.Column(scale=3, elem_classes=["column-spacing"]):
-            gr.Markdown("### 本卦", elem_classes=["section-header"])
-            gr.Markdown(
-                "<p style='color: #868e96; font-size: 12px; margin-top: -6px; margin-bottom: 10px;'>點擊爻線切換陽陰</p>",
-                elem_classes=["text-muted"]
-            )
+            _section_header("本卦", "點擊爻線切換陽陰")
             clickable_line_buttons = []
-            initial_code = DEFAULT_HEXAGRAM_CODE
-            # Create in reverse order for display (6 to 1)
-            for i in range(5, -1, -1):  # 5 to 0, so line 6 to line 1
-                line_num = i + 1
-                is_yang = initial_code[i] == '1'
-                # Format: "SYMBOL line_num爻" - no kanji in button text, CSS will add kanji on mobile via ::before
-                button_value = f"{UI_CONFIG.line_symbol_yang if is_yang else UI_CONFIG.line_symbol_yin} {line_num}爻"
-                
-                button_classes = ["yao-line-button"]
-                if is_yang:
-                    button_classes.append("yang-button")
-                else:
-                    button_classes.append("yin-button")
-                
-                elem_id = f"yao-btn-{line_num}"
+            # Create in display order (6 to 1), formatted exactly like the handler updates
+            for line_num in _VISUAL_ORDER:
+                initial = _clickable_button_update(_DEFAULT_CODE_BITS, 0, line_num)
                 line_button = gr.Button(
-                    value=button_value,
-                    elem_classes=button_classes,
-                    elem_id=elem_id
+                    value=initial["value"],
+                    elem_classes=initial["elem_classes"],
+                    elem_id=initial["elem_id"]
                 )
                 clickable_line_buttons.append((line_num, line_button))
         
         # Middle column: Checkboxes for 動爻
         with gr.Column(scale=1, elem_classes=["column-spacing"]):
-            gr.Markdown("### 動爻", elem_classes=["section-header"])
-            gr.Markdown(
-                "<p style='color: #868e96; font-size: 12px; margin-top: -6px; margin-bottom: 10px; line-height: 1.6; overflow: visible; white-space: normal; word-wrap: break-word;'>選擇變化的爻</p>",
-                elem_classes=["text-muted"]
-            )
+            _section_header("動爻", "選擇變化的爻")
             clickable_changing_checkboxes = []
-            # Create in reverse order for display (6 to 1)
-            for i in range(5, -1, -1):  # 5 to 0, so line 6 to line 1
-                line_num = i + 1
+            # Render top-down (6 to 1) but store ascending (index 0 = 1爻)
+            for line_num in _VISUAL_ORDER:
                 checkbox = gr.Checkbox(
                     label=f"{line_num}爻",
                     value=False,
@@ -491,197 +583,44 @@ def create_clickable_tab() -> Tuple[ClickableHexagramInputs, Callable]:
                     elem_classes=["changing-yao-checkbox"],
                     container=True
                 )
-                clickable_changing_checkboxes.append(checkbox)
-            clickable_changing_checkboxes.reverse()
+                clickable_changing_checkboxes.insert(0, checkbox)
         
         # Right column: Changed hexagram (變卦)
         with gr.Column(scale=3, elem_classes=["column-spacing"]):
-            gr.Markdown("### 變卦", elem_classes=["section-header"])
-            gr.Markdown(
-                "<p style='color: #868e96; font-size: 12px; margin-top: -6px; margin-bottom: 10px;'>變化後的卦象</p>",
-                elem_classes=["text-muted"]
-            )
-            clickable_changed_hexagram_line_containers = []
-            initial_code = DEFAULT_HEXAGRAM_CODE
-            # Create in reverse order for display (6 to 1)
-            for i in range(5, -1, -1):  # 5 to 0, so line 6 to line 1
-                line_num = i + 1
-                initial_html = create_line_html(initial_code, line_num, False, clickable=True)
-                line_html = gr.HTML(
-                    value=initial_html,
-                    elem_classes=["hexagram-line-container"]
-                )
-                clickable_changed_hexagram_line_containers.append(line_html)
-    
-    # Function to handle line button clicks
-    def handle_line_click(line_num, current_code, *changing_lines):
-        """Handle click on a line button - optimized for speed"""
-        if not current_code or len(current_code) != 6:
-            current_code = DEFAULT_HEXAGRAM_CODE
-        
-        # Toggle the line
-        code_list = list(current_code)
-        index = line_num - 1
-        code_list[index] = '1' if code_list[index] == '0' else '0'
-        new_code = ''.join(code_list)
-        
-        # Map checkbox values to line numbers (only once)
-        changing_line_nums = []
-        for visual_index, is_changing in enumerate(changing_lines):
-            line_num_actual = 6 - visual_index
-            if is_changing:
-                changing_line_nums.append(line_num_actual)
-        
-        # Calculate changed hexagram code (only once)
-        changed_code = calculate_changed_hexagram(new_code, changing_line_nums)
-        
-        # Only update the clicked button, not all 6
-        clicked_button_index = 6 - line_num  # Convert line_num (1-6) to visual index (0-5)
-        is_yang = new_code[index] == '1'
-        is_changing = line_num in changing_line_nums
-        line_symbol = UI_CONFIG.line_symbol_yang if is_yang else UI_CONFIG.line_symbol_yin
-        change_mark = UI_CONFIG.change_mark_yang if (is_changing and is_yang) else (UI_CONFIG.change_mark_yin if (is_changing and not is_yang) else "")
-        button_text = f"{line_symbol}{line_num}爻 {change_mark}"
-        
-        button_classes = ["yao-line-button"]
-        if is_yang:
-            button_classes.append("yang-button")
-        else:
-            button_classes.append("yin-button")
-        if is_changing:
-            button_classes.append("changing")
-        
-        elem_id = f"yao-btn-{line_num}"
-        clicked_button_update = gr.update(value=button_text, elem_classes=button_classes, elem_id=elem_id)
-        
-        # Create updates for all buttons (needed for proper state, but only clicked one changes)
-        button_updates = []
-        for visual_index in range(6):
-            actual_line_num = 6 - visual_index
-            if visual_index == clicked_button_index:
-                button_updates.append(clicked_button_update)
-            else:
-                # Keep other buttons unchanged
-                button_updates.append(gr.update())
-        
-        # Generate changed hexagram HTML (only for 變卦)
-        changed_line_htmls = []
-        for visual_index in range(6):
-            actual_line_num = 6 - visual_index
-            changed_html = create_changed_line_html(changed_code, actual_line_num)
-            changed_html = changed_html.replace(f">{actual_line_num}爻", f">  {actual_line_num}爻")
-            changed_line_htmls.append(changed_html)
-        
-        return [new_code] + button_updates + changed_line_htmls
-    
-    # Function to update displays when changing checkboxes change
-    def update_clickable_with_changing(code, *changing_lines):
-        """Update displays when changing lines checkboxes change"""
-        if not code or len(code) != 6:
-            code = DEFAULT_HEXAGRAM_CODE
-        
-        # Get changed hexagram updates
-        _, changed_updates = update_clickable_hexagram_display(code, *changing_lines)[1:]
-        
-        # Map checkbox values to line numbers
-        changing_line_nums = []
-        for visual_index, is_changing in enumerate(changing_lines):
-            line_num = 6 - visual_index
-            if is_changing:
-                changing_line_nums.append(line_num)
-        
-        # Update button styling based on changing lines
-        button_updates = []
-        for visual_index in range(6):
-            actual_line_num = 6 - visual_index
-            code_index = actual_line_num - 1
-            is_yang = code[code_index] == '1'
-            is_changing = actual_line_num in changing_line_nums
-            line_symbol = UI_CONFIG.line_symbol_yang if is_yang else UI_CONFIG.line_symbol_yin
-            change_mark = UI_CONFIG.change_mark_yang if (is_changing and is_yang) else (UI_CONFIG.change_mark_yin if (is_changing and not is_yang) else "")
-            # Format: "SYMBOL line_num爻 change_mark" - no kanji in button text, CSS will add kanji on mobile via ::before
-            button_text = f"{line_symbol}{actual_line_num}爻 {change_mark}"
-            
-            button_classes = ["yao-line-button"]
-            if is_yang:
-                button_classes.append("yang-button")
-            else:
-                button_classes.append("yin-button")
-            if is_changing:
-                button_classes.append("changing")
-            
-            elem_id = f"yao-btn-{actual_line_num}"
-            button_updates.append(gr.update(value=button_text, elem_classes=button_classes, elem_id=elem_id))
-        
-        return button_updates + changed_updates
+            _section_header("變卦", "變化後的卦象")
+            # Create in display order (6 to 1)
+            clickable_changed_hexagram_line_containers = [
+                gr.HTML(value=initial_html, elem_classes=["hexagram-line-container"])
+                for initial_html in _INITIAL_CHANGED_LINES
+            ]
     
     # Setup handlers function
     def setup_handlers():
-        # Wire up line button clicks
-        def make_line_click_handler(ln):
-            def handler(current_code, *changing_lines):
-                return handle_line_click(ln, current_code, *changing_lines)
-            return handler
+        # Each line's button and changed (變卦) container, keyed by line number
+        button_by_line = dict(clickable_line_buttons)
+        changed_container_by_line = dict(zip(_VISUAL_ORDER, clickable_changed_hexagram_line_containers))
         
+        # Wire up line button clicks; each click only outputs its own button
+        # and changed line, so no no-op updates for the other five go over the wire
         for line_num, button in clickable_line_buttons:
-            handler = make_line_click_handler(line_num)
             button.click(
-                fn=handler,
-                inputs=[
-                    clickable_hexagram_code_state,
-                    clickable_changing_checkboxes[5],  # 1爻
-                    clickable_changing_checkboxes[4],  # 2爻
-                    clickable_changing_checkboxes[3],  # 3爻
-                    clickable_changing_checkboxes[2],  # 4爻
-                    clickable_changing_checkboxes[1],  # 5爻
-                    clickable_changing_checkboxes[0],  # 6爻
-                ],
-                outputs=[clickable_hexagram_code_state] + [btn for _, btn in clickable_line_buttons] + clickable_changed_hexagram_line_containers,
-                queue=False  # Make updates immediate, no queue delay
-            )
-        
-        # Wire up each checkbox to update its corresponding state variable
-        checkbox_to_state_map = [
-            (clickable_changing_checkboxes[0], clickable_changing_state_1, 1),  # 1爻
-            (clickable_changing_checkboxes[1], clickable_changing_state_2, 2),  # 2爻
-            (clickable_changing_checkboxes[2], clickable_changing_state_3, 3),  # 3爻
-            (clickable_changing_checkboxes[3], clickable_changing_state_4, 4),  # 4爻
-            (clickable_changing_checkboxes[4], clickable_changing_state_5, 5),  # 5爻
-            (clickable_changing_checkboxes[5], clickable_changing_state_6, 6),  # 6爻
-        ]
-        
-        def create_simple_checkbox_handler(line_num):
-            def handler(checkbox_val):
-                return checkbox_val
-            return handler
-        
-        for checkbox, state_var, line_num in checkbox_to_state_map:
-            handler = create_simple_checkbox_handler(line_num)
-            checkbox.change(
-                fn=handler,
-                inputs=[checkbox],
-                outputs=[state_var],
-                queue=False  # Immediate UI feedback
+                fn=partial(handle_line_click, line_num),
+                inputs=[clickable_hexagram_code_state, *clickable_changing_checkboxes],
+                outputs=[clickable_hexagram_code_state, button, changed_container_by_line[line_num]],
+                queue=False,  # Make updates immediate, no queue delay
+                show_progress="hidden"
             )
         
-        # Wire all checkboxes to update display
-        def update_display_when_checkbox_changes(code, cb1, cb2, cb3, cb4, cb5, cb6):
-            return update_clickable_with_changing(code, cb1, cb2, cb3, cb4, cb5, cb6)
-        
-        for checkbox in clickable_changing_checkboxes:
-            checkbox.change(
-                fn=update_display_when_checkbox_changes,
-                inputs=[
-                    clickable_hexagram_code_state,
-                    clickable_changing_checkboxes[5],  # 1爻
-                    clickable_changing_checkboxes[4],  # 2爻
-                    clickable_changing_checkboxes[3],  # 3爻
-                    clickable_changing_checkboxes[2],  # 4爻
-                    clickable_changing_checkboxes[1],  # 5爻
-                    clickable_changing_checkboxes[0],  # 6爻
-                ],
-                outputs=[btn for _, btn in clickable_line_buttons] + clickable_changed_hexagram_line_containers,
-                queue=False  # Immediate UI feedback
+        # Wire all checkboxes to update display (each redraws only its own line);
+        # .input so only user toggles trigger it
+        for line_num, checkbox in enumerate(clickable_changing_checkboxes, start=1):
+            checkbox.input(
+                fn=partial(update_clickable_with_changing, line_num),
+                inputs=[clickable_hexagram_code_state, *clickable_changing_checkboxes],
+                outputs=[button_by_line[line_num], changed_container_by_line[line_num]],
+                queue=False,  # Immediate UI feedback
+                show_progress="hidden",
+                trigger_mode="always_last"  # Coalesce rapid re-toggles into one final redraw
             )
     
     # Calculate button with compact view checkbox
@@ -697,7 +636,6 @@ def create_clickable_tab() -> Tuple[ClickableHexagramInputs, Callable]:
     
     clickable_inputs = ClickableHexagramInputs(
         clickable_hexagram_code_state=clickable_hexagram_code_state,
-        clickable_changing_state_vars=clickable_changing_state_vars,
         clickable_line_buttons=clickable_line_buttons,
         clickable_changing_checkboxes=clickable_changing_checkboxes,
         clickable_changed_hexagram_line_containers=clickable_changed_hexagram_line_containers,
@@ -721,29 +659,43 @@ def coin_states_to_hexagram_code(coin_states: List[List[bool]]) -> Tuple[str, Li
         hexagram_code is a 6-character string of '0' and '1'
         changing_line_numbers is a list of line numbers (1-6) that are changing
     """
-    hexagram_code = ""
-    changing_lines = []
-    
-    for line_index, coins in enumerate(coin_states):
-        line_num = line_index + 1  # 1-6
-        heads_count = sum(coins)  # Count True values (heads)
-        
-        # Determine yin/yang based on coin count
-        # 3 heads or 2 heads 1 tail → yang ("1")
-        # 1 head 2 tails or 3 tails → yin ("0")
-        if heads_count >= 2:
-            hexagram_code += "1"  # yang
-        else:
-            hexagram_code += "0"  # yin
-        
-        # Determine if changing based on coin count
-        # 3 heads or 3 tails → is_changing=True
-        if heads_count == 3 or heads_count == 0:
-            changing_lines.append(line_num)
+    # Count heads per line once
+    heads_counts = [sum(coins) for coins in coin_states]
+    # 3 heads or 2 heads 1 tail → yang ("1"); 1 head 2 tails or 3 tails → yin ("0")
+    hexagram_code = "".join(["1" if heads_count >= 2 else "0" for heads_count in heads_counts])
+    # 3 heads or 3 tails → changing
+    changing_lines = [
+        line_index + 1  # 1-6
+        for line_index, heads_count in enumerate(heads_counts)
+        if heads_count in (0, 3)
+    ]
     
     return hexagram_code, changing_lines
 
 
+@lru_cache(maxsize=4096)
+def coin_outcomes_to_hexagram(outcome_indices: Tuple[int, ...]) -> Tuple[str, int]:
+    """
+    Convert selected coin toss outcomes to hexagram code and changing lines
+    
+    Cached per outcome tuple; all 4^6 combinations fit in the cache.
+    
+    Args:
+        outcome_indices: Tuple of 6 outcome indices (0=正正正, 1=正正反, 2=正反反, 3=反反反),
+        outcome_indices[0] = line 1 (bottom), outcome_indices[5] = line 6 (top)
+    
+    Returns:
+        Tuple of (hexagram_code, changing_mask)
+        changing_mask has bit 0 = line 1, bit 5 = line 6
+    """
+    # Convert outcomes to coin states (in visual order: 1,2,3,4,5,6)
+    coin_states_by_line = [_OUTCOME_COINS[outcome_idx] for outcome_idx in outcome_indices]
+    
+    # Convert to hexagram code (visual order is already 1,2,3,4,5,6, so no need to reverse)
+    hexagram_code, changing_lines = coin_states_to_hexagram_code(coin_states_by_line)
+    return hexagram_code, changing_lines_to_mask(changing_lines)
+
+
 def create_coin_toss_tab() -> Tuple[CoinTossHexagramInputs, Callable]:
     """
     Create the coin toss input tab with all handlers
@@ -751,37 +703,14 @@ def create_coin_toss_tab() -> Tuple[CoinTossHexagramInputs, Callable]:
     Returns:
         Tuple of (CoinTossHexagramInputs, setup_handlers function)
     """
-    gr.Markdown("### 新手擲幣", elem_classes=["section-header"])
-    gr.Markdown(
-        "<p style='color: #868e96; font-size: 13px; margin-top: -6px; margin-bottom: 12px;'>選擇每爻的擲幣結果：正正正、正正反、正反反、或反反反。數字為正面，圖案為反面。</p>",
-        elem_classes=["text-muted"]
-    )
+    _section_header("新手擲幣", "選擇每爻的擲幣結果：正正正、正正反、正反反、或反反反。數字為正面，圖案為反面。", _TAB_HINT_STYLE)
     
     # Store hexagram code state
     coin_toss_hexagram_code_state = gr.State(value=DEFAULT_HEXAGRAM_CODE)
     
-    # Store changing lines state (for checkboxes)
-    coin_toss_changing_state_1 = gr.State(value=False)  # 1爻
-    coin_toss_changing_state_2 = gr.State(value=False)  # 2爻
-    coin_toss_changing_state_3 = gr.State(value=False)  # 3爻
-    coin_toss_changing_state_4 = gr.State(value=False)  # 4爻
-    coin_toss_changing_state_5 = gr.State(value=False)  # 5爻
-    coin_toss_changing_state_6 = gr.State(value=False)  # 6爻
-    coin_toss_changing_state_vars = [
-        coin_toss_changing_state_1,
-        coin_toss_changing_state_2,
-        coin_toss_changing_state_3,
-        coin_toss_changing_state_4,
-        coin_toss_changing_state_5,
-        coin_toss_changing_state_6
-    ]
-    
-    # Store selected outcome for each line (0-3: 正正正, 正正反, 正反反, 反反反)
-    # Visual order: line 1, 2, 3, 4, 5, 6 (top to bottom) - reversed for beginners
-    selected_outcome_states = []
-    for line_num in range(1, 7):  # Visual order: 1 to 6 (reversed)
-        outcome_state = gr.State(value=0)  # Default to 正正正 (0)
-        selected_outcome_states.append(outcome_state)
+    # Store selected outcome for each line (0-3: 正正正, 正正反, 正反反, 反反反) in one
+    # tuple, visual order: line 1, 2, 3, 4, 5, 6 (top to bottom) - reversed for beginners
+    selected_outcomes_state = gr.State(value=(0,) * 6)  # Default to 正正正 (0)
     
     # Create outcome buttons section
     # Display order: line 1 at top, line 6 at bottom (reversed for beginners)
@@ -791,7 +720,7 @@ def create_coin_toss_tab() -> Tuple[CoinTossHexagramInputs, Callable]:
     for line_num in range(1, 7):  # Display from 1 to 6 (top to bottom) - reversed for beginners
         with gr.Row(elem_classes=["coin-toss-line"]):
             with gr.Column(scale=0, elem_classes=["coin-line-label"]):
-                gr.Markdown(f"**丟第{line_num}次的結果**")
+                gr.HTML(_COIN_LINE_LABELS[line_num - 1])
             
             line_outcome_buttons = []
             
@@ -799,14 +728,12 @@ def create_coin_toss_tab() -> Tuple[CoinTossHexagramInputs, Callable]:
             with gr.Row(scale=1, elem_classes=["coin-outcome-row"]):
                 for outcome_idx in range(4):
                     # Set default selected state for first button (正正正)
-                    button_classes = ["coin-outcome-button"]
-                    if outcome_idx == 0:  # Default to 正正正
-                        button_classes.extend(["coin-outcome-selected", "coin-yang"])
+                    button_classes = _COIN_LINE_CLASSES[0][outcome_idx]
                     
                     outcome_btn = gr.Button(
                         outcome_labels[outcome_idx],
                         size="sm",
-                        elem_classes=button_classes,
+                        elem_classes=list(button_classes),
                         scale=1,
                         min_width=50
                     )
@@ -814,25 +741,6 @@ def create_coin_toss_tab() -> Tuple[CoinTossHexagramInputs, Callable]:
             
             outcome_buttons.append(line_outcome_buttons)
     
-    # Function to convert outcome index to coin states
-    def outcome_to_coin_states(outcome_idx):
-        """Convert outcome index (0-3) to coin states (3 booleans)
-        
-        Args:
-            outcome_idx: 0=正正正, 1=正正反, 2=正反反, 3=反反反
-        
-        Returns:
-            List of 3 booleans (True=heads/正, False=tails/反)
-        """
-        if outcome_idx == 0:  # 正正正
-            return [True, True, True]
-        elif outcome_idx == 1:  # 正正反
-            return [True, True, False]
-        elif outcome_idx == 2:  # 正反反
-            return [True, False, False]
-        else:  # outcome_idx == 3: 反反反
-            return [False, False, False]
-    
     # Function to update hexagram code based on selected outcomes
     def update_coin_toss_display(*outcome_indices):
         """Update hexagram code when outcome selections change
@@ -841,118 +749,71 @@ def create_coin_toss_tab() -> Tuple[CoinTossHexagramInputs, Callable]:
             *outcome_indices: 6 outcome indices (0-3) in visual order: line1, line2, ..., line6
         
         Returns:
-            Updates for hexagram code and changing states
-        """
-        # Convert outcomes to coin states (in visual order: 1,2,3,4,5,6)
-        coin_states_by_line = []
-        for outcome_idx in outcome_indices:
-            coin_states = outcome_to_coin_states(outcome_idx)
-            coin_states_by_line.append(coin_states)
-        
-        # Convert to hexagram code (visual order is already 1,2,3,4,5,6, so no need to reverse)
-        hexagram_code, changing_lines = coin_states_to_hexagram_code(coin_states_by_line)
-        
-        # Update changing state variables
-        changing_state_updates = []
-        for line_num in range(1, 7):
-            is_changing = line_num in changing_lines
-            changing_state_updates.append(is_changing)
-        
-        return (
-            hexagram_code,  # hexagram code state
-            *changing_state_updates  # 6 changing state variables
-        )
-    
-    # Function to determine if outcome is yang or yin
-    def outcome_is_yang(outcome_idx):
-        """Determine if outcome represents yang (陽) or yin (陰)
-        
-        Args:
-            outcome_idx: 0=正正正, 1=正正反, 2=正反反, 3=反反反
-        
-        Returns:
-            True for yang (陽), False for yin (陰)
+            Hexagram code and changing-line bitmask (bit 0 = 1爻)
         """
-        # 正正正 (3 heads) or 正正反 (2 heads 1 tail) → yang
-        # 正反反 (1 head 2 tails) or 反反反 (3 tails) → yin
-        return outcome_idx <= 1
+        return coin_outcomes_to_hexagram(tuple(outcome_indices))
     
     # Function to handle outcome button click
-    def handle_outcome_click(visual_line_index, outcome_idx, *all_outcome_indices):
+    def handle_outcome_click(visual_line_index, outcome_idx, all_outcome_indices):
         """Handle click on an outcome button
         
         Args:
             visual_line_index: Visual line index (0=line1, 5=line6) - reversed order
             outcome_idx: Outcome index (0-3): 0=正正正, 1=正正反, 2=正反反, 3=反反反
-            *all_outcome_indices: All 6 outcome indices (in visual order: line1, line2, ..., line6)
+            all_outcome_indices: Tuple of all 6 outcome indices (in visual order: line1, line2, ..., line6)
         
         Returns:
-            Updates for the selected outcome state, hexagram code, changing states, and button highlights
+            Updates for the selected outcomes state, hexagram code,
+            and the clicked line's 4 button highlights (other lines never change)
         """
         # Convert to list for mutation
-        outcome_list = list(all_outcome_indices)
+        outcome_list = list(all_outcome_indices or (0,) * 6)
         
         # Update the selected outcome for this line
         outcome_list[visual_line_index] = outcome_idx
         
         # Update hexagram code and changing states
-        hexagram_code, *changing_states = update_coin_toss_display(*outcome_list)
+        hexagram_code, _ = update_coin_toss_display(*outcome_list)
         
-        # Update button highlights - only compute updates for the clicked line's 4 buttons
-        # Get the current outcome for this line to determine yang/yin
-        current_outcome = outcome_list[visual_line_index]
-        is_yang = outcome_is_yang(current_outcome)
-        
-        # Create updates for all 24 buttons
-        # For the clicked line, compute actual button classes
-        # For other lines, use gr.update() to keep current state (Gradio will skip these efficiently)
-        button_updates = []
-        for vis_idx in range(6):
-            for out_idx in range(4):
-                if vis_idx == visual_line_index:
-                    # For the clicked line, update all 4 buttons with proper classes
-                    if out_idx == current_outcome:
-                        # Selected button: red for yang, green for yin
-                        if is_yang:
-                            button_classes = ["coin-outcome-button", "coin-outcome-selected", "coin-yang"]
-                        else:
-                            button_classes = ["coin-outcome-button", "coin-outcome-selected", "coin-yin"]
-                    else:
-                        button_classes = ["coin-outcome-button"]
-                    button_updates.append(gr.update(elem_classes=button_classes))
-                else:
-                    # For other lines, use gr.update() to keep current state (no change)
-                    button_updates.append(gr.update())
+        # Update the clicked line's 4 buttons from the precomputed classes for its
+        # outcome; the listener only outputs this line's buttons, so the other 20 are never sent
+        button_updates = [
+            gr.update(elem_classes=list(button_classes))
+            for button_classes in _COIN_LINE_CLASSES[outcome_list[visual_line_index]]
+        ]
         
-        # Return: new outcome state, hexagram code, 6 changing states, 24 button updates (6 lines × 4 buttons)
-        return [outcome_idx] + [hexagram_code] + list(changing_states) + button_updates
+        # Return: new outcomes tuple, hexagram code, 4 button updates (clicked line)
+        return [tuple(outcome_list), hexagram_code] + button_updates
     
     # Setup handlers function
     def setup_handlers():
-        # Wire up outcome button clicks
+        # Wire up outcome button clicks: one shared dispatcher, the clicked
+        # button's (line, outcome) is looked up from the event's target.
+        # Registered once per line because each line outputs only its own 4 buttons
         # Note: visual_line_index 0 = line 1, visual_line_index 5 = line 6 (reversed order)
-        for visual_line_index in range(6):
-            for outcome_idx in range(4):
-                outcome_btn = outcome_buttons[visual_line_index][outcome_idx]
-                outcome_state_var = selected_outcome_states[visual_line_index]
-                
-                def make_outcome_handler(vis_idx, out_idx):
-                    def handler(*all_outcome_indices):
-                        return handle_outcome_click(vis_idx, out_idx, *all_outcome_indices)
-                    return handler
-                
-                handler = make_outcome_handler(visual_line_index, outcome_idx)
-                outcome_btn.click(
-                    fn=handler,
-                    inputs=selected_outcome_states,
-                    outputs=[
-                        selected_outcome_states[visual_line_index],  # Updated outcome state
-                        coin_toss_hexagram_code_state,
-                        *coin_toss_changing_state_vars,
-                        *[btn for line_btns in outcome_buttons for btn in line_btns]
-                    ],
-                    queue=False  # Immediate UI feedback
-                )
+        outcome_by_button = {
+            outcome_btn: (visual_line_index, outcome_idx)
+            for visual_line_index, line_btns in enumerate(outcome_buttons)
+            for outcome_idx, outcome_btn in enumerate(line_btns)
+        }
+        
+        def dispatch_outcome_click(evt: gr.EventData, all_outcome_indices):
+            visual_line_index, outcome_idx = outcome_by_button[evt.target]
+            return handle_outcome_click(visual_line_index, outcome_idx, all_outcome_indices)
+        
+        for visual_line_index, line_btns in enumerate(outcome_buttons):
+            gr.on(
+                triggers=[outcome_btn.click for outcome_btn in line_btns],
+                fn=dispatch_outcome_click,
+                inputs=[selected_outcomes_state],
+                outputs=[
+                    selected_outcomes_state,  # Updated outcomes tuple
+                    coin_toss_hexagram_code_state,
+                    *line_btns  # Only this line's 4 buttons can change
+                ],
+                queue=False,  # Immediate UI feedback
+                show_progress="hidden"
+            )
     
     # Calculate button with compact view checkbox
     gr.Markdown("---", elem_classes=["section-divider"])
@@ -967,9 +828,8 @@ def create_coin_toss_tab() -> Tuple[CoinTossHexagramInputs, Callable]:
     
     coin_toss_inputs = CoinTossHexagramInputs(
         coin_toss_hexagram_code_state=coin_toss_hexagram_code_state,
-        coin_toss_changing_state_vars=coin_toss_changing_state_vars,
         outcome_buttons=outcome_buttons,
-        selected_outcome_states=selected_outcome_states,
+        selected_outcomes_state=selected_outcomes_state,
         calculate_btn=calculate_btn,
         compact_view_checkbox=compact_view_checkbox
     )
@@ -4,16 +4,18 @@ Result display component for the Gradio UI
 This module contains the result display component that shows divination results.
 """
 
+import json
 from dataclasses import dataclass
 
 import gradio as gr
 
+from ..utils.formatting import GRANDMASTER_INSTRUCTIONS, RESULT_HEADER
 
-@dataclass
+
+@dataclass(slots=True, frozen=True)
 class ResultDisplay:
     """Components for displaying divination results"""
-    result_table: gr.Textbox
-    result_table_without_prompt: gr.Textbox
+    result_table: gr.Textbox  # result without prompt; the copy button appends the prompt
     copy_button: gr.Button
 
 
@@ -37,23 +39,13 @@ def create_result_display() -> ResultDisplay:
             size="sm",
             scale=0,
             min_width=80,
+            elem_id="copy-button",
             elem_classes=["copy-button"]
         )
     
-    # Visible textbox showing result without prompt
+    # Textbox showing the result without prompt; the prompt is only added when copying,
+    # so each result is sent to the browser once
     result_table = gr.Textbox(
-        label="",
-        lines=1,
-        visible=True,
-        interactive=False,
-        show_label=False,
-        container=False,
-        elem_classes=["result-table-hidden"],
-    )
-    
-    # Hidden textbox for result without prompt (used for copying)
-    # This will be hidden via CSS
-    result_table_without_prompt = gr.Textbox(
         label="",
         lines=40,
         max_lines=60,
@@ -73,59 +65,28 @@ def create_result_display() -> ResultDisplay:
                 return [];
             }
             
-            // Function to update button appearance
-            function updateButton(button, success) {
-                if (!button) return;
-                const originalText = button.textContent || button.innerText;
-                if (success) {
-                    button.textContent = '✓ 已複製';
-                    button.style.backgroundColor = '#4caf50';
-                    button.style.color = '#ffffff';
-                    setTimeout(function() {
-                        button.textContent = originalText;
-                        button.style.backgroundColor = '';
-                        button.style.color = '';
-                    }, 2000);
-                }
+            // Append the prompt to divination results (errors are copied as is)
+            if (text.startsWith(__RESULT_HEADER__)) {
+                text = text + __COPY_PROMPT__;
             }
             
-            // Find the copy button element
-            const buttons = document.querySelectorAll('button');
-            let copyBtn = null;
-            for (let btn of buttons) {
-                if (btn.textContent && (btn.textContent.includes('📋 複製') || btn.textContent.includes('複製'))) {
-                    copyBtn = btn;
-                    break;
-                }
+            // Show the copied state on the copy button (looked up by elem_id)
+            function markCopied() {
+                const button = document.getElementById('copy-button');
+                if (!button) return;
+                const originalText = button.textContent;
+                button.textContent = '✓ 已複製';
+                button.style.backgroundColor = '#4caf50';
+                button.style.color = '#ffffff';
+                setTimeout(function() {
+                    button.textContent = originalText;
+                    button.style.backgroundColor = '';
+                    button.style.color = '';
+                }, 2000);
             }
             
-            // Copy to clipboard
-            if (navigator.clipboard && navigator.clipboard.writeText) {
-                navigator.clipboard.writeText(text).then(function() {
-                    updateButton(copyBtn, true);
-                }).catch(function(err) {
-                    console.error('Failed to copy text: ', err);
-                    // Fallback method
-                    const textArea = document.createElement('textarea');
-                    textArea.value = text;
-                    textArea.style.position = 'fixed';
-                    textArea.style.left = '-9999px';
-                    textArea.style.top = '-9999px';
-                    document.body.appendChild(textArea);
-                    textArea.focus();
-                    textArea.select();
-                    try {
-                        const successful = document.execCommand('copy');
-                        if (successful) {
-                            updateButton(copyBtn, true);
-                        }
-                    } catch (err) {
-                        console.error('Fallback copy failed: ', err);
-                    }
-                    document.body.removeChild(textArea);
-                });
-            } else {
-                // Fallback for older browsers
+            // Fallback for pages without the Clipboard API (e.g. plain HTTP on a LAN address)
+            function fallbackCopy() {
                 const textArea = document.createElement('textarea');
                 textArea.value = text;
                 textArea.style.position = 'fixed';
@@ -135,9 +96,8 @@ def create_result_display() -> ResultDisplay:
                 textArea.focus();
                 textArea.select();
                 try {
-                    const successful = document.execCommand('copy');
-                    if (successful) {
-                        updateButton(copyBtn, true);
+                    if (document.execCommand('copy')) {
+                        markCopied();
                     }
                 } catch (err) {
                     console.error('Copy failed: ', err);
@@ -145,14 +105,27 @@ def create_result_display() -> ResultDisplay:
                 document.body.removeChild(textArea);
             }
             
+            // Copy to clipboard
+            if (navigator.clipboard && navigator.clipboard.writeText) {
+                navigator.clipboard.writeText(text).then(markCopied, function(err) {
+                    console.error('Failed to copy text: ', err);
+                    fallbackCopy();
+                });
+            } else {
+                fallbackCopy();
+            }
+            
             return [];
         }
-        """
+        """.replace(
+            "__RESULT_HEADER__", json.dumps(RESULT_HEADER.strip(), ensure_ascii=False)
+        ).replace(
+            "__COPY_PROMPT__", json.dumps(GRANDMASTER_INSTRUCTIONS, ensure_ascii=False)
+        )
     )
     
     return ResultDisplay(
-        result_table=result_table, 
-        result_table_without_prompt=result_table_without_prompt,
+        result_table=result_table,
         copy_button=copy_button
     )
 
@@ -6,7 +6,7 @@ used throughout the Gradio interface.
 """
 
 import os
-from typing import List, Dict
+from typing import List, Dict, FrozenSet
 from dataclasses import dataclass
 
 # Timezone configuration
@@ -27,6 +27,11 @@ EARTHLY_BRANCHES: List[str] = [
     "子", "丑", "寅", "卯", "辰", "巳", "午", "未", "申", "酉", "戌", "亥"
 ]
 
+# Every accepted stem + branch pillar string, for single-lookup validation
+VALID_GANZHI: FrozenSet[str] = frozenset(
+    stem + branch for stem in HEAVENLY_STEMS for branch in EARTHLY_BRANCHES
+)
+
 # Default hexagram code (乾為天 - all yang lines)
 DEFAULT_HEXAGRAM_CODE: str = "111111"
 
@@ -41,7 +46,7 @@ MIN_HOUR: int = 0
 MAX_HOUR: int = 23
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class ColorConfig:
     """Color configuration for hexagram lines"""
     # Yang line colors
@@ -67,7 +72,7 @@ class ColorConfig:
     yin_shadow_changing: str = "0 2px 6px rgba(46, 125, 50, 0.5)"
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class UIConfig:
     """UI configuration settings"""
     title: str = "六爻排盤系統"
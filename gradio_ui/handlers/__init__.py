@@ -6,20 +6,32 @@ Most handlers are embedded in component files for better cohesion. This module
 provides shared utilities and wrapper functions.
 """
 
-from .divination_handlers import (
-    process_divination,
-    process_divination_request,
-    DivinationRequest,
-    WesternDateInput,
-    GanzhiDateInput,
-    ButtonMethodInput,
-    NameMethodInput
-)
+from importlib import import_module
+
 from .date_handlers import determine_date_input_method
-from .hexagram_handlers import (
-    extract_changing_lines_from_checkboxes,
-    get_hexagram_code_from_state_or_dropdown
-)
+
+# Handlers that pull in the divination engine (liu_yao / ba_zi_base) are imported
+# on first attribute access (PEP 562), so importing the package stays light
+_LAZY_EXPORTS = {
+    "process_divination": ".divination_handlers",
+    "process_divination_request": ".divination_handlers",
+    "DivinationRequest": ".divination_handlers",
+    "WesternDateInput": ".divination_handlers",
+    "GanzhiDateInput": ".divination_handlers",
+    "ButtonMethodInput": ".divination_handlers",
+    "NameMethodInput": ".divination_handlers",
+    "extract_changing_lines_from_checkboxes": ".hexagram_handlers",
+    "get_hexagram_code_from_state_or_dropdown": ".hexagram_handlers",
+}
+
+
+def __getattr__(name):
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module_name, __name__), name)
+    globals()[name] = value  # Cache so later lookups skip __getattr__
+    return value
 
 __all__ = [
     "process_divination",
@@ -34,7 +34,5 @@ def determine_date_input_method(
         True if Western date method should be used, False if Gan-Zhi method should be used
     """
     # Use Western date if any pillar is missing/empty
-    if not (year_pillar and month_pillar and day_pillar and hour_pillar):
-        return True
-    return False
+    return not (year_pillar and month_pillar and day_pillar and hour_pillar)
 
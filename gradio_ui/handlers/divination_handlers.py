@@ -21,7 +21,7 @@ from ..utils.hexagram_utils import search_hexagram_by_name
 from ..utils.formatting import format_divination_results_pc, format_divination_results_mobile
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class WesternDateInput:
     """Input data for Western calendar date"""
     year: int
@@ -30,7 +30,7 @@ class WesternDateInput:
     hour: int
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class GanzhiDateInput:
     """Input data for Gan-Zhi calendar date"""
     year_pillar: str  # e.g., "甲子"
@@ -39,7 +39,7 @@ class GanzhiDateInput:
     hour_pillar: str
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ButtonMethodInput:
     """Input data for button method hexagram input"""
     yao1_type: str
@@ -56,7 +56,7 @@ class ButtonMethodInput:
     yao6_changing: bool
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class NameMethodInput:
     """Input data for name search method hexagram input"""
     hexagram_name_query: str
@@ -64,7 +64,7 @@ class NameMethodInput:
     changing_lines: List[bool]  # 6 boolean values for lines 1-6
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class DivinationRequest:
     """Complete divination request with all inputs"""
     use_western_date: bool
@@ -11,10 +11,11 @@ from liu_yao import HEXAGRAM_MAP
 from .config import UI_CONFIG
 from .utils.static_loader import load_static_assets
 from .components.date_inputs import create_date_inputs
-from .components.hexagram_inputs import create_hexagram_inputs
+from .components.hexagram_inputs import create_hexagram_inputs, coin_outcomes_to_hexagram
 from .components.result_display import create_result_display
 from .handlers.divination_handlers import process_divination, process_divination_for_ui
 from .handlers.hexagram_handlers import get_hexagram_code_from_state_or_dropdown
+from .utils.hexagram_utils import HEXAGRAM_CODE_BY_BITS
 
 
 def create_process_regular_tab_handler(
@@ -38,8 +39,7 @@ def create_process_regular_tab_handler(
         year_pillar_str, month_pillar_str, day_pillar_str, hour_pillar_str,
         active_date_tab,
         hexagram_dropdown_value, hexagram_code_state,
-        yao1_changing, yao2_changing, yao3_changing,
-        yao4_changing, yao5_changing, yao6_changing,
+        changing_line_nums,
         compact_view
     ):
         """Process divination for regular tab (name search method)"""
@@ -56,24 +56,16 @@ def create_process_regular_tab_handler(
             hexagram_dropdown_value
         )
         
-        # Map checkboxes to changing lines (checkboxes are in visual order: 6,5,4,3,2,1)
-        # yao1_changing is for line 6, yao6_changing is for line 1
-        checkbox_values = [
-            yao6_changing,  # line 1
-            yao5_changing,  # line 2
-            yao4_changing,  # line 3
-            yao3_changing,  # line 4
-            yao2_changing,  # line 5
-            yao1_changing,  # line 6
-        ]
-        changing_1 = bool(checkbox_values[0]) if checkbox_values[0] is not None else False
-        changing_2 = bool(checkbox_values[1]) if checkbox_values[1] is not None else False
-        changing_3 = bool(checkbox_values[2]) if checkbox_values[2] is not None else False
-        changing_4 = bool(checkbox_values[3]) if checkbox_values[3] is not None else False
-        changing_5 = bool(checkbox_values[4]) if checkbox_values[4] is not None else False
-        changing_6 = bool(checkbox_values[5]) if checkbox_values[5] is not None else False
+        # Map the checkbox group value (changing line numbers) to per-line flags
+        changing = set(changing_line_nums or [])
+        changing_1 = 1 in changing
+        changing_2 = 2 in changing
+        changing_3 = 3 in changing
+        changing_4 = 4 in changing
+        changing_5 = 5 in changing
+        changing_6 = 6 in changing
         
-        with_prompt, without_prompt = process_divination_for_ui(
+        _, without_prompt = process_divination_for_ui(
             use_western,
             year, month, day, hour,
             year_pillar_str, "", month_pillar_str, "",
@@ -85,8 +77,8 @@ def create_process_regular_tab_handler(
             changing_1, changing_2, changing_3, changing_4, changing_5, changing_6,
             is_mobile=bool(compact_view)
         )
-        # Return with_prompt for display, without_prompt for copy
-        return with_prompt, without_prompt
+        # Only the result without prompt is sent; the copy button appends the prompt
+        return without_prompt
     
     return process_regular_tab
 
@@ -124,11 +116,10 @@ def create_process_clickable_tab_handler(
         else:
             use_western = True
         
-        # Get hexagram code from clickable tab
-        code = clickable_hexagram_code if (
-            clickable_hexagram_code and 
-            len(clickable_hexagram_code) == 6 and 
-            clickable_hexagram_code in HEXAGRAM_MAP
+        # Get hexagram code from clickable tab (kept as a 6-bit int, bit 0 = line 1)
+        code = HEXAGRAM_CODE_BY_BITS[clickable_hexagram_code] if (
+            isinstance(clickable_hexagram_code, int) and
+            0 <= clickable_hexagram_code < 64
         ) else "111111"
         
         # Map checkboxes to changing lines
@@ -139,7 +130,7 @@ def create_process_clickable_tab_handler(
         changing_5 = bool(clickable_yao5_changing) if clickable_yao5_changing is not None else False
         changing_6 = bool(clickable_yao6_changing) if clickable_yao6_changing is not None else False
         
-        with_prompt, without_prompt = process_divination_for_ui(
+        _, without_prompt = process_divination_for_ui(
             use_western,
             year, month, day, hour,
             year_pillar_str, "", month_pillar_str, "",
@@ -151,8 +142,8 @@ def create_process_clickable_tab_handler(
             changing_1, changing_2, changing_3, changing_4, changing_5, changing_6,
             is_mobile=bool(compact_view)
         )
-        # Return with_prompt for display, without_prompt for copy
-        return with_prompt, without_prompt
+        # Only the result without prompt is sent; the copy button appends the prompt
+        return without_prompt
     
     return process_clickable_tab
 
@@ -178,8 +169,7 @@ def create_process_coin_toss_tab_handler(
         year_pillar_str, month_pillar_str, day_pillar_str, hour_pillar_str,
         active_date_tab,
         coin_toss_hexagram_code,
-        coin_toss_yao1_changing, coin_toss_yao2_changing, coin_toss_yao3_changing,
-        coin_toss_yao4_changing, coin_toss_yao5_changing, coin_toss_yao6_changing,
+        coin_toss_outcomes,
         compact_view
     ):
         """Process divination for coin toss tab"""
@@ -197,15 +187,16 @@ def create_process_coin_toss_tab_handler(
             coin_toss_hexagram_code in HEXAGRAM_MAP
         ) else "111111"
         
-        # Map checkboxes to changing lines
-        changing_1 = bool(coin_toss_yao1_changing) if coin_toss_yao1_changing is not None else False
-        changing_2 = bool(coin_toss_yao2_changing) if coin_toss_yao2_changing is not None else False
-        changing_3 = bool(coin_toss_yao3_changing) if coin_toss_yao3_changing is not None else False
-        changing_4 = bool(coin_toss_yao4_changing) if coin_toss_yao4_changing is not None else False
-        changing_5 = bool(coin_toss_yao5_changing) if coin_toss_yao5_changing is not None else False
-        changing_6 = bool(coin_toss_yao6_changing) if coin_toss_yao6_changing is not None else False
+        # Changing lines are derived from the selected outcomes (bit 0 = 1爻)
+        _, mask = coin_outcomes_to_hexagram(tuple(coin_toss_outcomes or (0,) * 6))
+        changing_1 = bool(mask & 1)
+        changing_2 = bool(mask & 2)
+        changing_3 = bool(mask & 4)
+        changing_4 = bool(mask & 8)
+        changing_5 = bool(mask & 16)
+        changing_6 = bool(mask & 32)
         
-        with_prompt, without_prompt = process_divination_for_ui(
+        _, without_prompt = process_divination_for_ui(
             use_western,
             year, month, day, hour,
             year_pillar_str, "", month_pillar_str, "",
@@ -217,8 +208,8 @@ def create_process_coin_toss_tab_handler(
             changing_1, changing_2, changing_3, changing_4, changing_5, changing_6,
             is_mobile=bool(compact_view)
         )
-        # Return with_prompt for display, without_prompt for copy
-        return with_prompt, without_prompt
+        # Only the result without prompt is sent; the copy button appends the prompt
+        return without_prompt
     
     return process_coin_toss_tab
 
@@ -370,16 +361,10 @@ def create_ui():
                 date_inputs.active_date_tab_state,
                 hexagram_inputs.name_search.hexagram_dropdown,
                 hexagram_inputs.name_search.selected_hexagram_code_state,
-                # Checkboxes in visual order: 6,5,4,3,2,1
-                hexagram_inputs.name_search.changing_checkboxes[0],  # 6爻
-                hexagram_inputs.name_search.changing_checkboxes[1],  # 5爻
-                hexagram_inputs.name_search.changing_checkboxes[2],  # 4爻
-                hexagram_inputs.name_search.changing_checkboxes[3],  # 3爻
-                hexagram_inputs.name_search.changing_checkboxes[4],  # 2爻
-                hexagram_inputs.name_search.changing_checkboxes[5],  # 1爻
+                hexagram_inputs.name_search.changing_checkbox_group,
                 hexagram_inputs.name_search.compact_view_checkbox,
             ],
-            outputs=[result_display.result_table, result_display.result_table_without_prompt]
+            outputs=[result_display.result_table]
         )
         
         # Clickable tab button
@@ -402,15 +387,10 @@ def create_ui():
                 date_inputs.ganzhi.hour_pillar_state,
                 date_inputs.active_date_tab_state,
                 hexagram_inputs.clickable.clickable_hexagram_code_state,
-                hexagram_inputs.clickable.clickable_changing_state_vars[0],  # 1爻
-                hexagram_inputs.clickable.clickable_changing_state_vars[1],  # 2爻
-                hexagram_inputs.clickable.clickable_changing_state_vars[2],  # 3爻
-                hexagram_inputs.clickable.clickable_changing_state_vars[3],  # 4爻
-                hexagram_inputs.clickable.clickable_changing_state_vars[4],  # 5爻
-                hexagram_inputs.clickable.clickable_changing_state_vars[5],  # 6爻
+                *hexagram_inputs.clickable.clickable_changing_checkboxes,  # 1爻 to 6爻
                 hexagram_inputs.clickable.compact_view_checkbox,
             ],
-            outputs=[result_display.result_table, result_display.result_table_without_prompt]
+            outputs=[result_display.result_table]
         )
         
         # Coin toss tab button
@@ -433,15 +413,10 @@ def create_ui():
                 date_inputs.ganzhi.hour_pillar_state,
                 date_inputs.active_date_tab_state,
                 hexagram_inputs.coin_toss.coin_toss_hexagram_code_state,
-                hexagram_inputs.coin_toss.coin_toss_changing_state_vars[0],  # 1爻
-                hexagram_inputs.coin_toss.coin_toss_changing_state_vars[1],  # 2爻
-                hexagram_inputs.coin_toss.coin_toss_changing_state_vars[2],  # 3爻
-                hexagram_inputs.coin_toss.coin_toss_changing_state_vars[3],  # 4爻
-                hexagram_inputs.coin_toss.coin_toss_changing_state_vars[4],  # 5爻
-                hexagram_inputs.coin_toss.coin_toss_changing_state_vars[5],  # 6爻
+                hexagram_inputs.coin_toss.selected_outcomes_state,
                 hexagram_inputs.coin_toss.compact_view_checkbox,
             ],
-            outputs=[result_display.result_table, result_display.result_table_without_prompt]
+            outputs=[result_display.result_table]
         )
     
     return demo
@@ -14,6 +14,9 @@ from typing import List, Dict, Any, Tuple
 from liu_yao import format_liu_yao_display_pc, format_liu_yao_display_mobile, display_shen_sha_definitions
 from ba_zi_base import BaZi
 
+# First line of every formatted result (the user fills in their question after it)
+RESULT_HEADER = "起卦人的問題是: "
+
 # Grandmaster instructions template (shared between PC and mobile formats)
 GRANDMASTER_INSTRUCTIONS = """
 
@@ -152,7 +155,7 @@ def _format_result_header(
     """
     output_parts = []
 
-    output_parts.append("起卦人的問題是: \n\n")
+    output_parts.append(RESULT_HEADER + "\n\n")
     
     # Format date: 日期: 乙巳年 丁亥月 戊申日 甲子時 (旬空:寅卯)
     xun_kong_list = []
@@ -4,15 +4,14 @@ Hexagram utility functions
 Functions for searching, calculating, and manipulating hexagrams.
 """
 
-from typing import List, Tuple, Optional
+from typing import Iterable, List, Tuple, Optional
 from functools import lru_cache
 
 from liu_yao import HEXAGRAM_MAP
 from ..config import DEFAULT_HEXAGRAM_CODE
 
 
-@lru_cache(maxsize=100)
-def search_hexagram_by_name(query: str) -> List[Tuple[str, str]]:
+def search_hexagram_by_name(query: str) -> Tuple[Tuple[str, str], ...]:
     """
     Search hexagrams by partial name match
     
@@ -20,19 +19,52 @@ def search_hexagram_by_name(query: str) -> List[Tuple[str, str]]:
         query: Search query (e.g., "山地", "天風")
     
     Returns:
-        List of tuples (hexagram_code, full_name)
+        Tuple of (hexagram_code, full_name) pairs
     """
-    if not query or len(query.strip()) == 0:
-        return []
+    if not query:
+        return ()
     
+    # Normalize before the cache so " 山地" and "山地" share one entry
     query = query.strip()
+    if not query:
+        return ()
+    
+    return _search_hexagram_by_name_cached(query)
+
+
+@lru_cache(maxsize=256)
+def _search_hexagram_by_name_cached(query: str) -> Tuple[Tuple[str, str], ...]:
+    """Cached name scan for an already stripped, non-empty query"""
     matches = []
     
     for code, info in HEXAGRAM_MAP.items():
         if query in info.name:
             matches.append((code, info.name))
     
-    return matches
+    # Tuple so the shared cached result cannot be mutated by callers
+    return tuple(matches)
+
+
+def search_hexagram_by_name_choices(query: str) -> Tuple[Tuple[str, ...], str]:
+    """
+    Search hexagrams by name and format the matches as dropdown choices
+    
+    Args:
+        query: Search query (e.g., "山地", "天風")
+    
+    Returns:
+        Tuple of (choices, first_code); choices are "code - name" strings,
+        first_code is "" when nothing matches
+    """
+    return _format_hexagram_choices(search_hexagram_by_name(query))
+
+
+@lru_cache(maxsize=256)
+def _format_hexagram_choices(matches: Tuple[Tuple[str, str], ...]) -> Tuple[Tuple[str, ...], str]:
+    """Format (code, name) matches as "code - name" dropdown choices plus the first code"""
+    if not matches:
+        return (), ""
+    return tuple(f"{code} - {name}" for code, name in matches), matches[0][0]
 
 
 def get_hexagram_code_from_dropdown(dropdown_value: str) -> str:
@@ -52,6 +84,9 @@ def get_hexagram_code_from_dropdown(dropdown_value: str) -> str:
 def calculate_changed_hexagram(original_code: str, changing_line_nums: List[int]) -> str:
     """Calculate the changed hexagram code by flipping changing lines
     
+    Results come from a precomputed (code, changing-line mask) table; a line
+    listed more than once is still flipped once.
+    
     Args:
         original_code: Original hexagram code (6 digits)
         changing_line_nums: List of line numbers (1-6) that are changing
@@ -59,17 +94,72 @@ def calculate_changed_hexagram(original_code: str, changing_line_nums: List[int]
     Returns:
         Changed hexagram code
     """
-    if not original_code or len(original_code) != 6:
-        return DEFAULT_HEXAGRAM_CODE
+    return calculate_changed_hexagram_from_mask(original_code, changing_lines_to_mask(changing_line_nums))
+
+
+# Hexagram code string (index 0 = line 1) for every 6-bit int (bit 0 = line 1)
+HEXAGRAM_CODE_BY_BITS = tuple(format(bits, "06b")[::-1] for bits in range(64))
+
+
+def hexagram_code_to_bits(code: str) -> int:
+    """Convert a hexagram code string to a 6-bit int
+    
+    Args:
+        code: Hexagram code (6 digits, index 0 = line 1)
+    
+    Returns:
+        Int where bit 0 = line 1, bit 5 = line 6 (inverse of HEXAGRAM_CODE_BY_BITS)
+    """
+    return int(code[::-1], 2)
+
+
+def changing_lines_to_mask(changing_line_nums: Iterable[int]) -> int:
+    """Pack changing line numbers into a bitmask
     
-    changed_code = list(original_code)
+    Args:
+        changing_line_nums: Line numbers (1-6) that are changing
+    
+    Returns:
+        Bitmask where bit 0 = line 1, bit 5 = line 6
+    """
+    mask = 0
     for line_num in changing_line_nums:
         if 1 <= line_num <= 6:
-            index = line_num - 1  # Convert to 0-based index
-            # Flip: 0 -> 1, 1 -> 0
-            changed_code[index] = '1' if changed_code[index] == '0' else '0'
+            mask |= 1 << (line_num - 1)
+    return mask
+
+
+# Changed code for every (code, changing mask) pair: 64 x 64 entries, built once
+_CHANGED_HEXAGRAM_CODES = {
+    (code, mask): HEXAGRAM_CODE_BY_BITS[bits ^ mask]
+    for bits, code in enumerate(HEXAGRAM_CODE_BY_BITS)
+    for mask in range(64)
+}
+
+
+def calculate_changed_hexagram_from_mask(original_code: str, changing_mask: int) -> str:
+    """Calculate the changed hexagram code from a changing-line bitmask
+    
+    Valid codes are looked up in a table precomputed at import time.
+    
+    Args:
+        original_code: Original hexagram code (6 digits)
+        changing_mask: Bitmask of changing lines (bit 0 = line 1, bit 5 = line 6)
+    
+    Returns:
+        Changed hexagram code
+    """
+    changed_code = _CHANGED_HEXAGRAM_CODES.get((original_code, changing_mask))
+    if changed_code is not None:
+        return changed_code
+    
+    if not original_code or len(original_code) != 6:
+        return DEFAULT_HEXAGRAM_CODE
     
-    return ''.join(changed_code)
+    return ''.join(
+        ('1' if bit == '0' else '0') if (changing_mask >> index) & 1 else bit
+        for index, bit in enumerate(original_code)
+    )
 
 
 def validate_hexagram_code(code: str) -> bool:
@@ -116,7 +206,7 @@ ELEMENT_TO_TRIGRAM = {
 
 
 @lru_cache(maxsize=100)
-def search_hexagram_by_trigrams(outer_element: str, inner_element: str) -> List[Tuple[str, str]]:
+def search_hexagram_by_trigrams(outer_element: str, inner_element: str) -> Tuple[Tuple[str, str], ...]:
     """
     Search hexagrams by outer and inner trigrams (represented by element names)
     
@@ -125,17 +215,17 @@ def search_hexagram_by_trigrams(outer_element: str, inner_element: str) -> List[
         inner_element: Inner trigram element name
     
     Returns:
-        List of tuples (hexagram_code, full_name)
+        Tuple of (hexagram_code, full_name) pairs
     """
     if not outer_element or not inner_element:
-        return []
+        return ()
     
     # Convert element names to trigrams
     outer_trigram = ELEMENT_TO_TRIGRAM.get(outer_element)
     inner_trigram = ELEMENT_TO_TRIGRAM.get(inner_element)
     
     if not outer_trigram or not inner_trigram:
-        return []
+        return ()
     
     matches = []
     seen_codes = set()  # Track codes to avoid duplicates
@@ -156,5 +246,22 @@ def search_hexagram_by_trigrams(outer_element: str, inner_element: str) -> List[
                     matches.append((code, info.name))
                     seen_codes.add(code)
     
-    return matches
+    # Tuple so the shared cached result cannot be mutated by callers
+    return tuple(matches)
+
+
+@lru_cache(maxsize=100)
+def search_hexagram_by_trigrams_choices(outer_element: str, inner_element: str) -> Tuple[Tuple[str, ...], str]:
+    """
+    Search hexagrams by trigrams and format the matches as dropdown choices
+    
+    Args:
+        outer_element: Outer trigram element name
+        inner_element: Inner trigram element name
+    
+    Returns:
+        Tuple of (choices, first_code); choices are "code - name" strings,
+        first_code is "" when nothing matches
+    """
+    return _format_hexagram_choices(search_hexagram_by_trigrams(outer_element, inner_element))
 
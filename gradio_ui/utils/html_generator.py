@@ -46,7 +46,16 @@ def get_line_style(is_yang: bool, is_changing: bool) -> Dict[str, str]:
     }
 
 
-@lru_cache(maxsize=500)
+# Styles for the 4 (is_yang, is_changing) combinations, built once; the config is frozen.
+# Shared read-only by the line HTML builders below, get_line_style still returns a fresh dict.
+_LINE_STYLES = {
+    (is_yang, is_changing): get_line_style(is_yang, is_changing)
+    for is_yang in (True, False)
+    for is_changing in (True, False)
+}
+
+
+@lru_cache(maxsize=2048)
 def create_line_html(code: str, line_num: int, is_changing: bool, clickable: bool = False) -> str:
     """
     Create HTML for a hexagram line (unified function for both regular and clickable)
@@ -61,11 +70,12 @@ def create_line_html(code: str, line_num: int, is_changing: bool, clickable: boo
         HTML string for the line
     """
     is_yang = code[line_num - 1] == '1'
-    style = get_line_style(is_yang, is_changing)
+    style = _LINE_STYLES[(is_yang, is_changing)]
     
     # Adjust yin line spacing for clickable version
+    line_html = style['line_html']
     if not is_yang and clickable:
-        style["line_html"] = UI_CONFIG.line_symbol_yin_clickable
+        line_html = UI_CONFIG.line_symbol_yin_clickable
     
     change_mark = ""
     if is_changing:
@@ -80,7 +90,7 @@ def create_line_html(code: str, line_num: int, is_changing: bool, clickable: boo
     return f"""
     <div class="hexagram-line {style['line_class']}" style="font-size: 26px; color: {style['text_color']}; font-weight: {'600' if is_changing else '400'}; padding: 12px 20px; border: 1.5px solid {style['border_color']}; border-radius: 8px; background: {style['bg_color']}; transition: all 0.3s ease; box-shadow: {style['shadow']}; text-align: center; width: 100%; min-height: 64px; height: 64px; display: flex; align-items: center; justify-content: center; box-sizing: border-box; {cursor_style}">
         <div style="display: flex; align-items: center; justify-content: center; gap: 12px;">
-            <span class="line-symbol-desktop" style="font-family: 'SimSun', '宋体', monospace;">{style['line_html']}</span>
+            <span class="line-symbol-desktop" style="font-family: 'SimSun', '宋体', monospace;">{line_html}</span>
             <span class="line-symbol-mobile" style="font-family: 'SimSun', '宋体', monospace;">{kanji}</span>
             <span style="font-size: 13px; color: #000000; font-weight: 600; letter-spacing: 0.5px;">{extra_spacing}{line_num}爻 {change_mark}</span>
         </div>
@@ -88,7 +98,7 @@ def create_line_html(code: str, line_num: int, is_changing: bool, clickable: boo
     """
 
 
-@lru_cache(maxsize=500)
+@lru_cache(maxsize=2048)
 def create_changed_line_html(changed_code: str, line_num: int) -> str:
     """
     Create HTML for a changed hexagram line (no changing marks, always static)
@@ -102,7 +112,7 @@ def create_changed_line_html(changed_code: str, line_num: int) -> str:
     """
     code_index = line_num - 1
     is_yang = changed_code[code_index] == '1'
-    style = get_line_style(is_yang, False)  # Changed lines are never marked as changing
+    style = _LINE_STYLES[(is_yang, False)]  # Changed lines are never marked as changing
     
     # Add kanji for mobile display
     kanji = "陽" if is_yang else "陰"
@@ -11,8 +11,7 @@ from ..config import (
     MIN_DAY, MAX_DAY,
     MIN_HOUR, MAX_HOUR,
     ERROR_MESSAGES,
-    HEAVENLY_STEMS,
-    EARTHLY_BRANCHES
+    VALID_GANZHI
 )
 from liu_yao import HEXAGRAM_MAP
 
@@ -115,31 +114,15 @@ def validate_ganzhi(ganzhi_str: str) -> Tuple[bool, Optional[str], Optional[str]
         If valid, error_message is None and tuple contains (stem, branch)
         If invalid, tuple contains error message and (None, None)
     """
-    if not ganzhi_str or len(ganzhi_str) != 2:
+    # One set lookup covers the length, stem and branch checks
+    if not ganzhi_str or ganzhi_str not in VALID_GANZHI:
         return (
             False,
             ERROR_MESSAGES["invalid_ganzhi"].format(ganzhi=ganzhi_str),
             None
         )
     
-    stem = ganzhi_str[0]
-    branch = ganzhi_str[1]
-    
-    if stem not in HEAVENLY_STEMS:
-        return (
-            False,
-            ERROR_MESSAGES["invalid_ganzhi"].format(ganzhi=ganzhi_str),
-            None
-        )
-    
-    if branch not in EARTHLY_BRANCHES:
-        return (
-            False,
-            ERROR_MESSAGES["invalid_ganzhi"].format(ganzhi=ganzhi_str),
-            None
-        )
-    
-    return (True, None, (stem, branch))
+    return (True, None, (ganzhi_str[0], ganzhi_str[1]))
 
 
 def validate_hexagram_code(code: str) -> Tuple[bool, Optional[str]]:
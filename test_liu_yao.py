@@ -328,10 +328,44 @@ def test_hexagram_111111_to_011111():
     else:
         print("✗ TEST FAILED: Hexagram change verification failed")
     print("=" * 70)
-    
+
     return yao_list, result_json, success
 
 
+def test_element_click_resets_changing_lines():
+    """Element clicks must clear the checked changing lines on every click
+
+    Gradio pops "value" from the returned update dict in place, so a reset
+    update shared between calls would lose its value after the first click.
+    """
+    import asyncio
+    from gradio_ui.ui_builder import create_ui
+    from gradio_ui.components.hexagram_inputs import handle_element_click
+
+    demo = create_ui()
+    block_fn = next(
+        fn for fn in demo.fns.values()
+        if getattr(fn.fn, "__name__", "") == "dispatch_element_click"
+    )
+    group_index = 3  # outputs: outer state, dropdown, code state, changing group, ...
+
+    for _ in range(2):
+        # Line 6 checked, first element click
+        predictions = list(handle_element_click("天", "", [6]))
+        outputs = asyncio.run(demo.postprocess_data(block_fn, predictions, None))
+        assert outputs[group_index].get("value") == []
+
+    # Second click (matching trigrams) also resets the checked lines
+    predictions = list(handle_element_click("水", "天", [6]))
+    outputs = asyncio.run(demo.postprocess_data(block_fn, predictions, None))
+    assert outputs[group_index].get("value") == []
+
+    # Nothing checked: the group is left untouched instead of being reset
+    predictions = list(handle_element_click("天", "", []))
+    outputs = asyncio.run(demo.postprocess_data(block_fn, predictions, None))
+    assert "value" not in outputs[group_index]
+
+
 def parse_args():
     """Parse command-line arguments"""
     parser = argparse.ArgumentParser(